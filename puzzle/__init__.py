@@ -0,0 +1,5 @@
+# Headless sliding-puzzle core, usable without pygame or a display.
+from .board import Board, goal_cells, is_solvable
+from .solver import Solver, UnsolvableError, solve
+
+__all__ = ["Board", "goal_cells", "is_solvable", "Solver", "UnsolvableError", "solve"]
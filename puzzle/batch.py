@@ -0,0 +1,136 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .solver import SearchLimitError, get_solver
+
+# Batch solver: reads boards from a file or stdin and streams one JSON result
+# per board to stdout.
+#
+# Input lines are either JSON objects ({"id": ..., "cells": [...]}, with an
+# optional "grid_size") or a bare permutation in row-major order with 0 for
+# the empty cell, separated by spaces or commas. Blank lines and lines
+# starting with "#" are skipped. Boards without an id are numbered by line.
+#
+# Only a bounded window of boards is in flight at once, so memory stays flat
+# however large the input is.
+
+WINDOW_PER_WORKER = 4  # Boards queued per worker process
+
+
+def parse_line(line, line_number):
+    # Returns (id, cells, grid_size) or None for lines to skip
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        record = json.loads(line)
+        cells = [int(value) for value in record["cells"]]
+        board_id = record.get("id", line_number)
+        grid_size = record.get("grid_size")
+    else:
+        cells = [int(value) for value in line.replace(",", " ").split()]
+        board_id = line_number
+        grid_size = None
+    if grid_size is None:
+        grid_size = math.isqrt(len(cells))
+    if grid_size * grid_size != len(cells):
+        raise ValueError(f"{len(cells)} cells do not make a square board")
+    return board_id, cells, grid_size
+
+
+def read_boards(stream):
+    # Yields (id, cells, grid_size) or (id, error message, None)
+    for line_number, line in enumerate(stream, 1):
+        try:
+            board = parse_line(line, line_number)
+        except (ValueError, KeyError, TypeError) as e:
+            yield line_number, str(e), None
+            continue
+        if board is not None:
+            yield board
+
+
+def solve_board(board_id, cells, grid_size, max_nodes=None):
+    # Runs in a worker process
+    if grid_size is None:
+        return {"id": board_id, "error": cells}
+    solver = get_solver(grid_size)
+    start = time.perf_counter()
+    try:
+        moves = solver.solve(cells, max_nodes)
+    except (ValueError, SearchLimitError) as e:
+        return {"id": board_id, "grid_size": grid_size, "error": str(e), "nodes": solver.nodes,
+                "seconds": round(time.perf_counter() - start, 6)}
+    return {
+        "id": board_id,
+        "grid_size": grid_size,
+        "length": len(moves),
+        "moves": [list(move) for move in moves],
+        "nodes": solver.nodes,
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+
+
+def run(stream, out, workers=None, ordered=True, max_nodes=None):
+    # Returns the number of boards written
+    workers = workers or os.cpu_count() or 1
+    window = workers * WINDOW_PER_WORKER
+    boards = read_boards(stream)
+    written = 0
+
+    def emit(result):
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        pending = deque()
+        exhausted = False
+        while pending or not exhausted:
+            # Keep the window full
+            while not exhausted and len(pending) < window:
+                board = next(boards, None)
+                if board is None:
+                    exhausted = True
+                else:
+                    pending.append(pool.submit(solve_board, *board, max_nodes))
+            if not pending:
+                break
+
+            if ordered:
+                emit(pending.popleft().result())
+                written += 1
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    emit(future.result())
+                    written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve sliding-puzzle boards optimally, one JSON result per line")
+    parser.add_argument("input", nargs="?", default="-", help="board file (default: stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="emit results as they finish instead of in input order")
+    parser.add_argument("--max-nodes", type=int, default=None, help="give up on a board after this many nodes")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        run(sys.stdin, sys.stdout, args.workers, not args.unordered, args.max_nodes)
+    else:
+        with open(args.input) as stream:
+            run(stream, sys.stdout, args.workers, not args.unordered, args.max_nodes)
+
+
+if __name__ == "__main__":
+    main()
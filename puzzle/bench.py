@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keep stdout pure JSON
+
+from . import game
+from .board import Board
+from .solver import SearchLimitError, Solver
+
+# Benchmarks for the engine and renderer hot paths.
+#
+# Each benchmark times a batch of operations a few times and keeps the best
+# run, reported as seconds per operation. Rendering uses SDL's dummy driver,
+# so this runs without a display. Results are JSON; with --baseline the run
+# is compared against a saved result and exits non-zero when any benchmark
+# got slower by more than the threshold.
+
+REPEAT = 5  # Timed runs per benchmark, after one warm-up; the fastest is kept
+THRESHOLD = 0.2  # Slowdown (as a fraction) that counts as a regression
+CORPUS_SIZE = 10  # Seeded boards per grid size for the solver benchmark
+CORPUS_WALK = 40  # Random-walk length used to scramble those boards
+SOLVER_NODE_LIMIT = 200000  # Cap per corpus board, so large grids stay quick
+CORPUS_SEED = 2024
+
+
+def timed(run, number, setup=None, repeat=REPEAT):
+    # Best seconds per operation over `repeat` runs of `run(number, state)`;
+    # `setup()` prepares untimed state for each run
+    best = float("inf")
+    for attempt in range(repeat + 1):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(number, state)
+        if attempt:
+            best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def random_walk(board, length, rng):
+    # (x, y) of each tile slid on a non-backtracking walk from `board`'s layout
+    board = board.copy()
+    n = board.grid_size
+    moves = []
+    previous = -1
+    for _ in range(length):
+        cell = rng.choice([cell for cell in board.movable_cells() if cell != previous])
+        previous = board.empty_index
+        board.move_index(cell)
+        moves.append((cell % n, cell // n))
+    return moves
+
+
+def bench_move_tile(grid_size, number):
+    puzzle = game.PuzzleGame(grid_size, seed=CORPUS_SEED)
+    puzzle.layout = list(puzzle.board.cells)
+    walk = random_walk(puzzle.board, number, random.Random(CORPUS_SEED))
+
+    def setup():
+        puzzle.shuffle()  # Back to the saved layout
+        return walk
+
+    def run(number, moves):
+        move_tile = puzzle.move_tile
+        for x, y in moves:
+            move_tile(x, y)
+
+    return timed(run, number, setup)
+
+
+def bench_shuffle(grid_size, number):
+    puzzle = game.PuzzleGame(grid_size, seed=CORPUS_SEED)
+
+    def run(number, state):
+        for _ in range(number):
+            puzzle.shuffle()
+
+    return timed(run, number)
+
+
+def bench_check_solved(grid_size, number):
+    puzzle = game.PuzzleGame(grid_size, seed=CORPUS_SEED)
+
+    def run(number, state):
+        check_solved = puzzle.check_solved
+        for _ in range(number):
+            check_solved()
+
+    return timed(run, number)
+
+
+def bench_create_image(grid_size, image_choice, number):
+    puzzle = game.PuzzleGame(grid_size, image_choice, seed=CORPUS_SEED)
+
+    def run(number, state):
+        for _ in range(number):
+            game.image_cache.clear()  # Time the render, not the cache lookup
+            puzzle.create_image()
+
+    return timed(run, number)
+
+
+def bench_game_draw(grid_size, image_choice, number):
+    puzzle = game.PuzzleGame(grid_size, image_choice, seed=CORPUS_SEED)
+
+    def run(number, state):
+        for _ in range(number):
+            game.screen.fill(game.WHITE)
+            puzzle.draw()
+
+    return timed(run, number)
+
+
+def bench_menu_draw(grid_size, state, number):
+    # A full frame through Menu.draw, forced past the dirty-rect shortcut
+    menu = game.Menu()
+    menu.difficulty = grid_size
+    menu.state = state
+    if state == "game":
+        menu.game = game.PuzzleGame(grid_size, seed=CORPUS_SEED)
+
+    def run(number, state):
+        for _ in range(number):
+            menu.drawn = None
+            menu.draw()
+
+    return timed(run, number)
+
+
+def solver_corpus(grid_size):
+    rng = random.Random(CORPUS_SEED + grid_size)
+    boards = []
+    for _ in range(CORPUS_SIZE):
+        board = Board(grid_size)
+        for x, y in random_walk(board, CORPUS_WALK, rng):
+            board.move(x, y)
+        boards.append(list(board.cells))
+    return boards
+
+
+def bench_solver(grid_size):
+    # Seconds per node over the seeded corpus; no pattern database, so the
+    # numbers do not depend on which tables happen to be built locally
+    solver = Solver(grid_size)
+    corpus = solver_corpus(grid_size)
+    best = float("inf")
+    for _ in range(REPEAT):
+        nodes = 0
+        start = time.perf_counter()
+        for cells in corpus:
+            try:
+                solver.solve(cells, SOLVER_NODE_LIMIT)
+            except SearchLimitError:
+                pass
+            nodes += solver.nodes
+        best = min(best, (time.perf_counter() - start) / max(nodes, 1))
+    return best
+
+
+def run_benchmarks(grids, scale=1.0, log=None):
+    # Returns {benchmark name: seconds per operation}
+    game.init_display(headless=True)
+    images = [image["name"] for image in game.sample_images]
+
+    def count(number):
+        return max(1, int(number * scale))
+
+    results = {}
+
+    def record(name, seconds):
+        results[name] = seconds
+        if log:
+            log(f"{name:32} {seconds * 1e6:12.3f} us")
+
+    for n in grids:
+        size = f"{n}x{n}"
+        record(f"move_tile/{size}", bench_move_tile(n, count(20000)))
+        record(f"shuffle/{size}", bench_shuffle(n, count(500)))
+        record(f"check_solved/{size}", bench_check_solved(n, count(50000)))
+        for image in images:
+            record(f"create_image/{image}/{size}", bench_create_image(n, image, count(20)))
+            record(f"game_draw/{image}/{size}", bench_game_draw(n, image, count(100)))
+        record(f"menu_draw/game/{size}", bench_menu_draw(n, "game", count(100)))
+        record(f"solver_node/{size}", bench_solver(n))
+    record("menu_draw/main", bench_menu_draw(grids[0], "main", count(100)))
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    # Rows of (name, baseline seconds, current seconds, ratio, regressed)
+    rows = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before:
+            ratio = seconds / before
+            rows.append((name, before, seconds, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sliding-puzzle engine and renderer")
+    parser.add_argument("--grids", type=int, nargs="+", default=list(range(3, 9)),
+                        help="grid sizes to run (default: 3 to 8)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply operation counts, e.g. 0.1 for a quick run")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="saved JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="slowdown fraction that fails the comparison (default: %(default)s)")
+    args = parser.parse_args(argv)
+    game.PERSIST_HINTS = False  # Leave the player's hint cache alone
+
+    def log(line):
+        print(line, file=sys.stderr)
+
+    results = run_benchmarks(args.grids, args.scale, log)
+    report = {
+        "python": platform.python_version(),
+        "pygame": game.pygame.version.ver,
+        "numpy": game.numpy is not None,
+        "unit": "seconds per operation",
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        rows = compare(results, baseline, args.threshold)
+        log(f"\n{'benchmark':32} {'baseline':>12} {'current':>12} {'change':>8}")
+        for name, before, seconds, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            log(f"{name:32} {before * 1e6:10.3f}us {seconds * 1e6:10.3f}us {ratio - 1:+8.1%}{flag}")
+        regressions = sum(row[4] for row in rows)
+        if regressions:
+            log(f"{regressions} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import random
+from array import array
+
+# Array typecode for board cells; "H" (unsigned short) covers boards far
+# larger than the game offers while staying compact.
+CELL_TYPE = "H"
+
+
+def goal_cells(grid_size):
+    # Solved layout in row-major order: 1, 2, ..., n*n - 1 and the empty cell (0) last
+    size = grid_size * grid_size
+    return list(range(1, size)) + [0]
+
+
+def pack_cells(cells):
+    # Compact bytes for a board, used for cache keys, recordings and server
+    # sessions: one byte per cell where values fit, otherwise two
+    cells = list(cells)
+    if len(cells) <= 256:
+        return bytes(cells)
+    return array(CELL_TYPE, cells).tobytes()
+
+
+def unpack_cells(data, grid_size):
+    if grid_size * grid_size <= 256:
+        return list(data)
+    return list(array(CELL_TYPE, data))
+
+
+def permutation_parity(values):
+    # Parity of the inversion count of a permutation of 1..len(values), found
+    # in linear time from its cycle decomposition
+    seen = bytearray(len(values))
+    parity = 0
+    for start in range(len(values)):
+        length = 0
+        i = start
+        while not seen[i]:
+            seen[i] = 1
+            i = values[i] - 1
+            length += 1
+        if length:
+            parity ^= (length - 1) & 1
+    return parity
+
+
+def is_solvable(cells, grid_size):
+    # Inversion-parity rule: on odd widths the inversion count must be even;
+    # on even widths it must have the opposite parity to the empty cell's row
+    # counted from the bottom (1-based).
+    parity = permutation_parity([value for value in cells if value])
+    if grid_size % 2:
+        return parity == 0
+    row_from_bottom = grid_size - list(cells).index(0) // grid_size
+    return (parity + row_from_bottom) % 2 == 1
+
+
+class Board:
+    def __init__(self, grid_size, cells=None):
+        self.grid_size = grid_size
+        self.size = grid_size * grid_size
+        self.goal = array(CELL_TYPE, goal_cells(grid_size))
+        self.cells = array(CELL_TYPE, self.goal)  # cell index -> value
+        self.pos = array(CELL_TYPE, bytes(2 * self.size))  # value -> cell index
+        self.misplaced = 0  # tiles (not counting the empty cell) off their goal cell
+        self.manhattan = 0  # sum of tile distances to their goal cells
+        if cells is not None:
+            self.set_cells(cells)
+        else:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        pos = self.pos
+        for index, value in enumerate(self.cells):
+            pos[value] = index
+
+        # Recount the running totals that move_index keeps up to date
+        self.misplaced = 0
+        self.manhattan = 0
+        for value in range(1, self.size):
+            distance = self.tile_distance(value, pos[value])
+            if distance:
+                self.misplaced += 1
+                self.manhattan += distance
+
+    def tile_distance(self, value, index):
+        # Manhattan distance from cell `index` to the goal cell of `value`
+        n = self.grid_size
+        goal = value - 1
+        return abs(index % n - goal % n) + abs(index // n - goal // n)
+
+    def set_cells(self, cells):
+        if sorted(cells) != list(range(self.size)):
+            raise ValueError(f"expected a permutation of 0..{self.size - 1}")
+        self.cells = array(CELL_TYPE, cells)
+        self._rebuild_index()
+
+    def shuffle(self, rng=None):
+        # Uniformly random solvable layout (never the goal) in one pass: an
+        # unsolvable draw is fixed by swapping two tiles, which flips the
+        # permutation parity without moving the empty cell
+        rng = rng or random
+        cells = list(range(self.size))
+        while True:
+            rng.shuffle(cells)
+            if not is_solvable(cells, self.grid_size):
+                i, j = [index for index, value in enumerate(cells[:3]) if value][:2]
+                cells[i], cells[j] = cells[j], cells[i]
+            if cells != list(self.goal):
+                break
+        self.set_cells(cells)
+
+    def copy(self):
+        return Board(self.grid_size, self.cells)
+
+    @property
+    def empty_index(self):
+        return self.pos[0]
+
+    @property
+    def empty_x(self):
+        return self.pos[0] % self.grid_size
+
+    @property
+    def empty_y(self):
+        return self.pos[0] // self.grid_size
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.grid_size and 0 <= y < self.grid_size
+
+    def value_at(self, x, y):
+        return self.cells[y * self.grid_size + x]
+
+    def position_of(self, value):
+        index = self.pos[value]
+        return index % self.grid_size, index // self.grid_size
+
+    def can_move(self, x, y):
+        # A tile can slide if it is orthogonally adjacent to the empty cell
+        if not self.in_bounds(x, y):
+            return False
+        empty = self.pos[0]
+        ex, ey = empty % self.grid_size, empty // self.grid_size
+        return abs(x - ex) + abs(y - ey) == 1
+
+    def movable_cells(self):
+        # Cell indices of the tiles that can slide into the empty cell
+        n = self.grid_size
+        empty = self.pos[0]
+        ex, ey = empty % n, empty // n
+        cells = []
+        if ex > 0:
+            cells.append(empty - 1)
+        if ex < n - 1:
+            cells.append(empty + 1)
+        if ey > 0:
+            cells.append(empty - n)
+        if ey < n - 1:
+            cells.append(empty + n)
+        return cells
+
+    def move_index(self, index):
+        # Slide the tile at cell `index` into the empty cell (no adjacency check)
+        cells = self.cells
+        empty = self.pos[0]
+        value = cells[index]
+
+        # Only the sliding tile changes distance, so the totals update in O(1)
+        old = self.tile_distance(value, index)
+        new = self.tile_distance(value, empty)
+        self.manhattan += new - old
+        if not old:
+            self.misplaced += 1
+        elif not new:
+            self.misplaced -= 1
+
+        cells[empty] = value
+        cells[index] = 0
+        self.pos[value] = empty
+        self.pos[0] = index
+        return value
+
+    def move(self, x, y):
+        if not self.can_move(x, y):
+            return False
+        self.move_index(y * self.grid_size + x)
+        return True
+
+    def is_solved(self):
+        # With every tile home the empty cell is necessarily home too
+        return self.misplaced == 0
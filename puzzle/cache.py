@@ -0,0 +1,122 @@
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .board import pack_cells
+
+# Hint cache: packed board -> (next optimal move, moves remaining).
+#
+# An in-memory LRU layer sits in front of an optional SQLite file, so a
+# position solved once answers instantly in later sessions too. Storing a
+# whole solution path caches every position along it, since each suffix of
+# an optimal path is itself optimal. Disk writes go through a writer thread
+# with its own connection, so storing a path never blocks the render loop.
+
+HINT_CACHE_SIZE = 100000  # Positions kept in memory
+
+
+class HintCache:
+    def __init__(self, capacity=HINT_CACHE_SIZE, path=None):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # key -> (tile cell or -1, distance), least recent first
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.db = None
+        self.writer = None
+        if path:
+            self.db = sqlite3.connect(path)
+            # WAL lets lookups read while the writer thread commits
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS hints (key BLOB PRIMARY KEY, tile INTEGER, distance INTEGER)")
+            self.db.commit()
+            self.pending = queue.Queue()  # Lists of rows waiting for the writer
+            self.writer = threading.Thread(target=self._write, args=(path,), name="puzzle-hint-cache", daemon=True)
+            self.writer.start()
+
+    def _write(self, path):
+        # Writer thread: store queued paths, batching whatever has piled up
+        # into one transaction, until close() queues None
+        db = sqlite3.connect(path)
+        running = True
+        while running:
+            rows = self.pending.get()
+            if rows is None:
+                break
+            while True:
+                try:
+                    more = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    running = False
+                    break
+                rows += more
+            with db:
+                db.executemany("INSERT OR REPLACE INTO hints VALUES (?, ?, ?)", rows)
+        db.close()
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, cells, grid_size):
+        # ((x, y) or None if solved, distance), or None on a miss
+        key = pack_cells(cells)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        elif self.db is not None:
+            row = self.db.execute("SELECT tile, distance FROM hints WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = tuple(row)
+                self._remember(key, entry)
+                self.disk_hits += 1
+        if entry is None:
+            self.misses += 1
+            return None
+        tile, distance = entry
+        move = (tile % grid_size, tile // grid_size) if tile >= 0 else None
+        return move, distance
+
+    def put_path(self, cells, grid_size, moves):
+        # Cache every position along an optimal solution (moves as (x, y))
+        cells = list(cells)
+        rows = []
+        for k, (x, y) in enumerate(moves):
+            tile = y * grid_size + x
+            key = pack_cells(cells)
+            entry = (tile, len(moves) - k)
+            self._remember(key, entry)
+            rows.append((key,) + entry)
+            empty = cells.index(0)
+            cells[empty], cells[tile] = cells[tile], 0
+        if self.writer is not None and rows:
+            self.pending.put(rows)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        # Waits for queued writes to reach the disk
+        if self.writer is not None:
+            self.pending.put(None)
+            self.writer.join()
+            self.writer = None
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,106 @@
+import numpy
+
+from .board import goal_cells
+
+# Vectorized scoring of many boards at once.
+#
+# `evaluate` takes an (N, n*n) integer array of boards (uint8 is enough up to
+# 15x15) and returns solvability, Manhattan distance, linear conflicts and
+# the misplaced-tile count for every board as arrays. Everything is NumPy
+# broadcasting over the whole batch; the only Python loops run over cells or
+# lines of the grid, never over boards. The metrics match Board and Solver
+# exactly, and the goal layout comes from the same goal_cells.
+
+CHUNK_SIZE = 65536  # Boards scored per pass, bounding temporary memory
+
+
+def goal_tables(grid_size):
+    # Goal row and column per tile value; -1 for the empty cell
+    n = grid_size
+    goal = numpy.array(goal_cells(n), numpy.int32)
+    goal_row = numpy.full(n * n, -1, numpy.int32)
+    goal_col = numpy.full(n * n, -1, numpy.int32)
+    index = numpy.arange(n * n)
+    tiles = goal != 0
+    goal_row[goal[tiles]] = index[tiles] // n
+    goal_col[goal[tiles]] = index[tiles] % n
+    return goal, goal_row, goal_col
+
+
+def _increasing_runs(keys, in_line):
+    # Longest increasing subsequence of the in-line keys along the last axis
+    length = keys.shape[-1]
+    best = numpy.zeros(keys.shape, numpy.int32)
+    for i in range(length):
+        earlier = in_line[..., :i] & (keys[..., :i] < keys[..., i:i + 1])
+        run = numpy.where(earlier, best[..., :i], 0).max(axis=-1, initial=0) + 1
+        best[..., i] = numpy.where(in_line[..., i], run, 0)
+    return best.max(axis=-1, initial=0)
+
+
+def _evaluate_chunk(boards, n, goal, goal_row, goal_col):
+    count, size = boards.shape
+    tiles = boards != 0
+
+    # Solvability: inversion parity among the tiles, plus the empty row on
+    # even widths (same rule as board.is_solvable)
+    inversions = numpy.zeros(count, numpy.int64)
+    for i in range(size - 1):
+        later = boards[:, i + 1:]
+        inversions += ((later < boards[:, i:i + 1]) & (later != 0)).sum(axis=1)
+    if n % 2:
+        solvable = inversions % 2 == 0
+    else:
+        row_from_bottom = n - numpy.argmin(boards, axis=1) // n
+        solvable = (inversions + row_from_bottom) % 2 == 1
+
+    misplaced = ((boards != goal) & tiles).sum(axis=1)
+
+    index = numpy.arange(size)
+    rows = numpy.broadcast_to(index // n, boards.shape)
+    cols = numpy.broadcast_to(index % n, boards.shape)
+    distance = numpy.abs(rows - goal_row[boards]) + numpy.abs(cols - goal_col[boards])
+    manhattan = numpy.where(tiles, distance, 0).sum(axis=1)
+
+    # Linear conflicts: rows and columns as one (N, 2n, n) stack of lines,
+    # each keyed by the goal positions of the tiles that belong to that line
+    grid = boards.reshape(count, n, n)
+    lines = numpy.arange(n)[None, :, None]
+    by_row, by_col = grid, grid.transpose(0, 2, 1)
+    in_line = numpy.concatenate([goal_row[by_row] == lines, goal_col[by_col] == lines], axis=1)
+    keys = numpy.concatenate([goal_col[by_row], goal_row[by_col]], axis=1)
+    conflicts = 2 * (in_line.sum(axis=-1) - _increasing_runs(keys, in_line))
+    linear_conflicts = conflicts.sum(axis=1)
+
+    return solvable, manhattan, linear_conflicts, misplaced
+
+
+def evaluate(boards, grid_size=None):
+    # Returns a dict of arrays, one entry per board: "solvable" (bool),
+    # "manhattan", "linear_conflicts" and "misplaced"
+    boards = numpy.asarray(boards)
+    if boards.ndim != 2:
+        raise ValueError("expected an (N, n*n) array of boards")
+    count, size = boards.shape
+    n = grid_size or int(numpy.sqrt(size) + 0.5)
+    if n * n != size:
+        raise ValueError(f"{size} cells do not make a {n}x{n} board")
+
+    goal, goal_row, goal_col = goal_tables(n)
+    cells = numpy.arange(size)
+    results = {
+        "solvable": numpy.empty(count, bool),
+        "manhattan": numpy.empty(count, numpy.int32),
+        "linear_conflicts": numpy.empty(count, numpy.int32),
+        "misplaced": numpy.empty(count, numpy.int32),
+    }
+    for start in range(0, count, CHUNK_SIZE):
+        # Checked and widened one chunk at a time, so no temporary is ever
+        # the size of the whole batch
+        chunk = boards[start:start + CHUNK_SIZE]
+        if not (numpy.sort(chunk, axis=1) == cells).all():
+            raise ValueError(f"every board must be a permutation of 0..{size - 1}")
+        chunk = _evaluate_chunk(chunk.astype(numpy.intp, copy=False), n, goal, goal_row, goal_col)
+        for name, values in zip(results, chunk):
+            results[name][start:start + CHUNK_SIZE] = values
+    return results
@@ -0,0 +1,1144 @@
+import pygame
+import sys
+import random
+import time
+import os
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:  # Image generation falls back to per-pixel drawing
+    numpy = None
+
+from . import perfect
+from .board import Board
+from .cache import HintCache
+from .hints import HintWorker
+from .paths import cache_dir
+from .pool import PuzzlePool
+from .profiler import FrameProfiler, format_stats
+from .record import MoveLog, Replay, latest_unfinished
+from .solver import SearchLimitError, get_solver
+
+# Game constants
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+FPS = 60
+TILE_SPEED = 600  # Tile animation speed in pixels per second
+HINT_DURATION = 3  # Seconds a hint stays highlighted
+DIRTY_RECTS = True  # Redraw only changed screen areas; False repaints every frame
+HINT_NODE_LIMIT = 50000  # Search nodes (about 0.1 s) per synchronous hint before the greedy fallback
+ASYNC_HINTS = True  # Search 4x4 and larger hints in a worker process
+PERSIST_HINTS = True  # Keep solved hint positions on disk between sessions
+PROFILE_FRAMES = 120  # Frames covered by a cProfile run (F5)
+LARGE_GRIDS = (8, 10, 16, 24, 32, 50)  # Sizes offered by the "Large" difficulty button
+MIN_TILE_SIZE = 32  # Large boards start zoomed in to at least this many pixels per tile
+ZOOM_LEVELS = (16, 24, 32, 48, 64)  # Tile sizes the mouse wheel steps through
+MAX_HINT_GRID = 10  # Hints are offered up to this grid size
+EXACT_HINT_GRID = 4  # Largest board whose hints search to the end, given pattern databases
+ASYNC_HINT_NODE_LIMIT = 2000000  # Search nodes (a few seconds) allowed for any other worker hint
+RECORD_GAMES = True  # Record every game's moves so it can be resumed or replayed
+
+# Custom event carrying hint results from the worker process
+HINT_EVENT = pygame.USEREVENT + 1
+
+# Arrow keys scroll large boards: key -> (dx, dy)
+SCROLL_KEYS = {
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+}
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GRAY = (150, 150, 150)
+BLUE = (0, 0, 255)
+GREEN = (0, 200, 0)
+RED = (200, 0, 0)
+PURPLE = (120, 40, 160)
+
+# The display surface, created by init_display()
+screen = None
+
+# Sample images for puzzles
+sample_images = [
+    {"name": "Numbers", "type": "generated"},
+    {"name": "Grid", "type": "generated"},
+    {"name": "Nature", "type": "generated"},
+]
+
+# Generated images keyed by (image_choice, board_size, grid_size), least
+# recently used first; each zoom level of a large board adds one
+IMAGE_CACHE_SIZE = 4
+image_cache = OrderedDict()
+
+# Pre-rendered tile sprites (indexed by tile value) under the same keys, least
+# recently used first; zoomed-in large boards make these big
+SPRITE_CACHE_SIZE = 4
+sprite_cache = OrderedDict()
+
+# One font object per size, shared by everything that draws text
+fonts = {}
+
+# Rendered text surfaces keyed by (text, size, color), least recently used first
+TEXT_CACHE_SIZE = 256
+text_cache = OrderedDict()
+
+# Hint searches run off the render loop; the worker is created on first use
+hint_worker = None
+
+def get_hint_worker():
+    global hint_worker
+    if hint_worker is None:
+        hint_worker = HintWorker(post_hint)
+    return hint_worker
+
+def post_hint(request_id, move, final, moves):
+    # Called on the worker's listener thread; event.post is thread-safe
+    pygame.event.post(pygame.event.Event(HINT_EVENT, request=request_id, move=move, final=final, moves=moves))
+
+# Solved positions, in memory and (with PERSIST_HINTS) on disk across sessions
+hint_cache = None
+
+def get_hint_cache():
+    global hint_cache
+    if hint_cache is None:
+        path = None
+        if PERSIST_HINTS:
+            os.makedirs(cache_dir(), exist_ok=True)
+            path = os.path.join(cache_dir(), "hints.sqlite")
+        hint_cache = HintCache(path=path)
+    return hint_cache
+
+# Frame-time profiler: F3 toggles it with its overlay, F4 exports the
+# per-frame trace and F5 runs cProfile for PROFILE_FRAMES frames
+profiler = FrameProfiler()
+profile_overlay = False
+
+def get_font(size):
+    if size not in fonts:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        fonts[size] = pygame.font.Font(None, size)
+    return fonts[size]
+
+def render_text(text, size, color):
+    key = (text, size, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = text_cache[key] = get_font(size).render(text, True, color)
+        if len(text_cache) > TEXT_CACHE_SIZE:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+    return surface
+
+class Tile:
+    def __init__(self, value, x, y):
+        self.value = value  # The number on the tile (0 represents the empty tile)
+        self.x = x  # Grid position x
+        self.y = y  # Grid position y
+        self.rect = None  # Will be set when grid size is determined
+        self.target_x = 0
+        self.target_y = 0
+        self.current_x = 0
+        self.current_y = 0
+        self.moving = False
+
+    def set_position(self, grid_size, tile_size):
+        self.rect = pygame.Rect(self.x * tile_size, self.y * tile_size, tile_size, tile_size)
+        self.target_x = self.x * tile_size
+        self.target_y = self.y * tile_size
+        self.current_x = self.target_x
+        self.current_y = self.target_y
+
+    def update(self, dt):
+        # Smooth movement animation, timed in seconds so speed does not
+        # depend on the frame rate
+        if self.moving:
+            move_speed = TILE_SPEED * dt
+            dx = self.target_x - self.current_x
+            dy = self.target_y - self.current_y
+
+            if abs(dx) < move_speed:
+                self.current_x = self.target_x
+            else:
+                self.current_x += move_speed if dx > 0 else -move_speed
+
+            if abs(dy) < move_speed:
+                self.current_y = self.target_y
+            else:
+                self.current_y += move_speed if dy > 0 else -move_speed
+
+            if self.current_x == self.target_x and self.current_y == self.target_y:
+                self.moving = False
+
+        self.rect.x = round(self.current_x)
+        self.rect.y = round(self.current_y)
+
+    def move_to(self, x, y, tile_size):
+        self.x = x
+        self.y = y
+        self.target_x = x * tile_size
+        self.target_y = y * tile_size
+        self.moving = True
+
+class PuzzleGame:
+    def __init__(self, difficulty=3, image_choice="Numbers", seed=None, cells=None, optimal_length=None):
+        self.tiles = []
+        self.seed = seed  # Same seed, same scramble
+        self.rng = random.Random(seed)
+        self.layout = cells  # Ready-made scramble to start from instead of shuffling
+        self.optimal_length = optimal_length  # Known optimal solution length, if any
+        self.grid_size = difficulty  # 3x3 up to the largest of LARGE_GRIDS
+
+        # The board is shown through a fixed square view; boards too large to
+        # fit at a readable tile size scroll inside it and can be zoomed
+        self.view_size = min(500, min(SCREEN_WIDTH, SCREEN_HEIGHT) - 100)
+        self.board_x = (SCREEN_WIDTH - self.view_size) // 2
+        self.board_y = (SCREEN_HEIGHT - self.view_size) // 2 + 30
+        fit = self.view_size // self.grid_size
+        self.zoom_levels = [fit] + [size for size in ZOOM_LEVELS if size > fit]
+        self.view_x = self.view_y = 0  # Scroll offset of the view into the board
+        self.set_tile_size(next((size for size in self.zoom_levels if size >= MIN_TILE_SIZE),
+                                self.zoom_levels[-1]))
+        self.sprites = []  # value -> pre-rendered tile surface
+
+        self.board = Board(self.grid_size)
+        self.tile_for = []  # value -> Tile, a rendering view over self.board
+        self.moves = 0
+        self.solved = False
+        self.start_time = time.time()
+        self.elapsed_time = 0
+        self.image_choice = image_choice
+        self.full_image = None
+        self.hint_active = False
+        self.hint_tile = None
+        self.hint_expires = 0  # time.time() at which the shown hint goes away
+        self.hint_request = None  # Id of the hint search in flight, if any
+        self.log = None  # MoveLog recording this game, if any
+
+        # Dirty-rectangle tracking for the renderer
+        self.animating = []  # Tiles still sliding towards their target
+        self.dirty = []  # Screen rects changed since the last frame
+        self.hud_drawn = {}  # HUD line index -> (text, rect) last drawn
+        self.full_redraw = True
+
+        self.create_puzzle()
+
+    @property
+    def empty_x(self):
+        return self.board.empty_x
+
+    @property
+    def empty_y(self):
+        return self.board.empty_y
+
+    def set_tile_size(self, tile_size):
+        # The board fills the view exactly unless it has to scroll
+        self.tile_size = tile_size
+        self.board_size = max(self.view_size, tile_size * self.grid_size)
+        self.view_x = min(self.view_x, self.board_size - self.view_size)
+        self.view_y = min(self.view_y, self.board_size - self.view_size)
+
+    def create_puzzle(self):
+        # Create the full image based on choice, and the tile sprites
+        self.create_image()
+        self.create_sprites()
+
+        # Create ordered tiles
+        self.board = Board(self.grid_size)
+        self.tiles = []
+        value = 1
+        for y in range(self.grid_size):
+            for x in range(self.grid_size):
+                if y == self.grid_size - 1 and x == self.grid_size - 1:
+                    # Last tile is empty (0)
+                    tile = Tile(0, x, y)
+                else:
+                    tile = Tile(value, x, y)
+
+                tile.set_position(self.grid_size, self.tile_size)
+                self.tiles.append(tile)
+                value += 1
+
+        self.tile_for = [None] * len(self.tiles)
+        for tile in self.tiles:
+            self.tile_for[tile.value] = tile
+
+        # Shuffle the puzzle
+        self.shuffle()
+
+    def create_image(self):
+        if self.image_choice == "Numbers":
+            self.full_image = None  # Just use numbers
+            return
+
+        # Generated images only depend on the layout, so Restart reuses them
+        key = (self.image_choice, self.board_size, self.grid_size)
+        image = image_cache.get(key)
+        if image is None:
+            image = image_cache[key] = self.render_image()
+            if len(image_cache) > IMAGE_CACHE_SIZE:
+                image_cache.popitem(last=False)
+        else:
+            image_cache.move_to_end(key)
+        self.full_image = image
+
+    def create_sprites(self):
+        key = (self.image_choice, self.board_size, self.grid_size)
+        sprites = sprite_cache.get(key)
+        if sprites is None:
+            sprites = sprite_cache[key] = self.render_sprites()
+            if len(sprite_cache) > SPRITE_CACHE_SIZE:
+                sprite_cache.popitem(last=False)
+        else:
+            sprite_cache.move_to_end(key)
+        self.sprites = sprites
+
+    def render_sprites(self):
+        # One finished surface per tile, so drawing the board is a single
+        # batched blit; image tiles are views into one bordered copy of the
+        # image rather than copies of its pixels
+        size = self.tile_size
+        sprites = [None]
+        if self.full_image:
+            atlas = self.full_image.copy()
+            for value in range(1, self.grid_size * self.grid_size):
+                y, x = divmod(value - 1, self.grid_size)
+                rect = pygame.Rect(x * size, y * size, size, size)
+                pygame.draw.rect(atlas, BLACK, rect, 2)
+                sprites.append(atlas.subsurface(rect))
+            return sprites
+
+        # Numbered tiles; the number and corner radius shrink on small tiles
+        radius = min(10, size // 5)
+        digits = len(str(self.grid_size * self.grid_size - 1))
+        font = get_font(min(36, size // 2, size * 9 // (5 * digits)))
+        blank = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(blank, BLUE, blank.get_rect(), border_radius=radius)
+        pygame.draw.rect(blank, BLACK, blank.get_rect(), 2, border_radius=radius)
+        if pygame.display.get_surface() is not None:
+            blank = blank.convert_alpha()
+        for value in range(1, self.grid_size * self.grid_size):
+            sprite = blank.copy()
+            text = font.render(str(value), True, WHITE)
+            sprite.blit(text, text.get_rect(center=(size // 2, size // 2)))
+            sprites.append(sprite)
+        return sprites
+
+    def render_image(self):
+        image = pygame.Surface((self.board_size, self.board_size))
+        if numpy is None:
+            self.render_image_slow(image)
+            return image
+
+        size = self.board_size
+        pixels = numpy.zeros((size, size, 3), numpy.uint8)  # Indexed [x, y] like surfarray
+        if self.image_choice == "Grid":
+            # Create a colorful grid pattern with a 2px black border per tile
+            coords = numpy.arange(size)
+            cell = coords // self.tile_size
+            offset = coords % self.tile_size
+            edge = (offset < 2) | (offset >= self.tile_size - 2) | (cell >= self.grid_size)
+            x = cell[:, None]
+            y = cell[None, :]
+            fill = ~(edge[:, None] | edge[None, :])
+            pixels[..., 0] = (x * 50) % 255 * fill
+            pixels[..., 1] = (y * 50) % 255 * fill
+            pixels[..., 2] = ((x + y) * 30) % 255 * fill
+        else:  # Nature or any other option - create a gradient
+            x = numpy.arange(size)[:, None]
+            y = numpy.arange(size)[None, :]
+            pixels[..., 0] = 255 * x // size
+            pixels[..., 1] = 255 * y // size
+            pixels[..., 2] = 255 * (x + y) // (2 * size)
+
+        pygame.surfarray.blit_array(image, pixels)
+        return image
+
+    def render_image_slow(self, image):
+        # Per-pixel fallback for installs without NumPy
+        if self.image_choice == "Grid":
+            for y in range(self.grid_size):
+                for x in range(self.grid_size):
+                    color = ((x * 50) % 255, (y * 50) % 255, ((x+y) * 30) % 255)
+                    rect = pygame.Rect(
+                        x * self.tile_size,
+                        y * self.tile_size,
+                        self.tile_size,
+                        self.tile_size
+                    )
+                    pygame.draw.rect(image, color, rect)
+                    pygame.draw.rect(image, BLACK, rect, 2)
+        else:
+            for y in range(self.board_size):
+                for x in range(self.board_size):
+                    r = int(255 * x / self.board_size)
+                    g = int(255 * y / self.board_size)
+                    b = int(255 * (x + y) / (2 * self.board_size))
+                    image.set_at((x, y), (r, g, b))
+
+    def shuffle(self):
+        # Draw a uniformly random solvable layout directly on the board
+        if self.layout is not None:
+            self.board.set_cells(self.layout)
+        else:
+            self.board.shuffle(self.rng)
+
+        # Place the tile views at their shuffled cells
+        self.sync_tiles()
+        self.animating = []
+        self.full_redraw = True
+
+        # Reset moves counter and timer after shuffling
+        self.moves = 0
+        self.start_time = time.time()
+        self.elapsed_time = 0
+        self.solved = False
+
+    def record(self):
+        # Start recording from the current layout; without a writable cache
+        # directory the game just goes unrecorded
+        self.close_log()
+        try:
+            self.log = MoveLog.create(self.grid_size, self.board.cells, self.image_choice)
+        except OSError:
+            self.log = None
+
+    def resume(self, log):
+        # Continue a recorded game; the board must already hold its layout
+        self.log = log
+        self.moves = log.moves
+        self.start_time = time.time() - log.elapsed
+        self.elapsed_time = log.elapsed
+
+    def close_log(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def sync_tiles(self):
+        for tile in self.tiles:
+            tile.x, tile.y = self.board.position_of(tile.value)
+            tile.set_position(self.grid_size, self.tile_size)
+
+    def zoom(self, steps):
+        # Step through zoom_levels, keeping the middle of the view in place
+        level = self.zoom_levels.index(self.tile_size)
+        level = max(0, min(len(self.zoom_levels) - 1, level + steps))
+        old_size = self.tile_size
+        if self.zoom_levels[level] == old_size:
+            return
+        half = self.view_size // 2
+        center_x = (self.view_x + half) * self.zoom_levels[level] // old_size
+        center_y = (self.view_y + half) * self.zoom_levels[level] // old_size
+        self.set_tile_size(self.zoom_levels[level])
+        self.view_x, self.view_y = 0, 0
+        self.scroll(center_x - half, center_y - half)
+
+        self.create_image()
+        self.create_sprites()
+        self.sync_tiles()  # Snaps any sliding tile to its cell
+        self.animating = []
+
+    def scroll(self, dx, dy):
+        self.view_x = max(0, min(self.board_size - self.view_size, self.view_x + dx))
+        self.view_y = max(0, min(self.board_size - self.view_size, self.view_y + dy))
+        self.full_redraw = True
+
+    def view_rect(self):
+        return pygame.Rect(self.board_x, self.board_y, self.view_size, self.view_size)
+
+    def cell_at(self, pos):
+        # Grid cell (x, y) under a screen position, or None outside the board
+        if not self.view_rect().collidepoint(pos):
+            return None
+        x = (pos[0] - self.board_x + self.view_x) // self.tile_size
+        y = (pos[1] - self.board_y + self.view_y) // self.tile_size
+        return (x, y) if self.board.in_bounds(x, y) else None
+
+    def visible_tiles(self, area):
+        # Tiles in or next to a screen area of the view; the margin covers
+        # tiles mid-slide
+        n, size = self.grid_size, self.tile_size
+        cells = self.board.cells
+        left = area.x - self.board_x + self.view_x
+        top = area.y - self.board_y + self.view_y
+        x0 = max(0, left // size - 1)
+        y0 = max(0, top // size - 1)
+        x1 = min(n, (left + area.width) // size + 2)
+        y1 = min(n, (top + area.height) // size + 2)
+        tile_for = self.tile_for
+        return [tile_for[cells[y * n + x]] for y in range(y0, y1) for x in range(x0, x1) if cells[y * n + x]]
+
+    def get_tile_at(self, x, y):
+        if not self.board.in_bounds(x, y):
+            return None
+        return self.tile_for[self.board.value_at(x, y)]
+
+    def move_tile(self, x, y, play_sound=True):
+        # Check if the clicked tile is adjacent to the empty tile
+        empty_x, empty_y = self.empty_x, self.empty_y
+        if self.board.move(x, y):
+            # Slide the tile view into the old empty cell
+            tile = self.tile_for[self.board.value_at(empty_x, empty_y)]
+            tile.move_to(empty_x, empty_y, self.tile_size)
+            if tile not in self.animating:
+                self.animating.append(tile)
+            empty_tile = self.tile_for[0]
+            empty_tile.x, empty_tile.y = x, y
+            self.moves += 1
+            if self.log is not None:
+                n = self.grid_size
+                try:
+                    self.log.append(empty_y * n + empty_x, y * n + x, self.board.cells, time.time() - self.start_time)
+                except OSError:
+                    self.close_log()
+
+            # A pending hint search is for a position that no longer exists
+            self.cancel_hint()
+
+            self.check_solved()
+            return True
+        return False
+
+    def check_solved(self):
+        # Check if the puzzle is solved (a counter check on the board)
+        self.solved = self.board.is_solved()
+
+        if self.solved:
+            self.elapsed_time = time.time() - self.start_time
+            self.full_redraw = True  # The solved overlay covers the whole screen
+            if self.log is not None:
+                self.log.finish(self.elapsed_time)
+                self.close_log()
+
+    def distance_to_goal(self):
+        # Exact on 3x3 (a single table lookup), otherwise the running
+        # Manhattan total the board updates on every move; 3x3 shows the
+        # Manhattan total too while its table loads in the background
+        if self.grid_size == perfect.GRID_SIZE:
+            if perfect.ready():
+                return perfect.get_table().distance(self.board.cells)
+            perfect.load_in_background()
+        return self.board.manhattan
+
+    def misplaced_tiles(self):
+        return self.board.misplaced
+
+    def show_hint(self):
+        # Highlight the next tile on an optimal path to the solution
+        if self.grid_size > MAX_HINT_GRID:
+            return  # The solver's tables grow with the square of the board
+        self.hint_active = True
+        self.hint_expires = time.time() + HINT_DURATION
+
+        if self.grid_size == perfect.GRID_SIZE or not ASYNC_HINTS:
+            self.set_hint_tile(self.next_hint_move())
+            return
+
+        # Positions solved before (in any session) need no search
+        cached = get_hint_cache().get(self.board.cells, self.grid_size)
+        if cached:
+            self.set_hint_tile(cached[0])
+            return
+
+        # Show the greedy step at once, then refine it as the search deepens.
+        # Without pattern databases, or past EXACT_HINT_GRID, an exact search
+        # may never finish, so it stops at a node budget and leaves its best
+        # step so far
+        solver = get_solver(self.grid_size)
+        self.set_hint_tile(solver.greedy_move(self.board.cells))
+        exact = self.grid_size <= EXACT_HINT_GRID and solver.pdb is not None
+        max_nodes = None if exact else ASYNC_HINT_NODE_LIMIT
+        self.hint_request = get_hint_worker().request(self.grid_size, self.board.cells, max_nodes)
+
+    def cancel_hint(self):
+        # Drop the hint search in flight, if any; its answer would be stale
+        if self.hint_request is not None:
+            get_hint_worker().cancel()
+            self.hint_request = None
+
+    def set_hint_tile(self, move):
+        if self.hint_tile:
+            self.dirty.append(self.screen_rect(self.hint_tile))
+        self.hint_tile = self.get_tile_at(*move) if move else None
+        if self.hint_tile:
+            self.dirty.append(self.screen_rect(self.hint_tile))
+
+    def receive_hint(self, request_id, move, final, moves=None):
+        # Partial or final result of the search started by show_hint
+        if request_id != self.hint_request:
+            return  # Cancelled by a move or superseded by a newer request
+        if final:
+            self.hint_request = None
+            self.hint_expires = time.time() + HINT_DURATION
+            if moves is not None:
+                get_hint_cache().put_path(self.board.cells, self.grid_size, moves)
+        if move is not None:  # A search that ran out of budget keeps the step shown
+            self.set_hint_tile(move)
+
+    def next_hint_move(self):
+        # 3x3 uses its distance table once loaded, and the solver until then
+        if self.grid_size == perfect.GRID_SIZE and perfect.ready():
+            return perfect.get_table().next_move(self.board.cells)
+
+        cached = get_hint_cache().get(self.board.cells, self.grid_size)
+        if cached:
+            return cached[0]
+
+        solver = get_solver(self.grid_size)
+        try:
+            moves = solver.solve(self.board.cells, HINT_NODE_LIMIT)
+            get_hint_cache().put_path(self.board.cells, self.grid_size, moves)
+            return moves[0] if moves else None
+        except SearchLimitError:
+            # Too deep to solve within a frame budget; fall back to a greedy step
+            return solver.greedy_move(self.board.cells)
+
+    def update(self, dt):
+        # Only animating tiles need updating; each one dirties the area it
+        # left and the area it moved into
+        for tile in self.animating:
+            old_rect = self.screen_rect(tile)
+            tile.update(dt)
+            self.dirty.append(old_rect.union(self.screen_rect(tile)))
+        self.animating = [tile for tile in self.animating if tile.moving]
+
+        if not self.solved:
+            self.elapsed_time = time.time() - self.start_time
+
+        # The hint countdown starts once its search has finished; like the
+        # game timer it runs on the wall clock, not on frame time
+        if self.hint_active and self.hint_request is None:
+            if time.time() >= self.hint_expires:
+                if self.hint_tile:
+                    self.dirty.append(self.screen_rect(self.hint_tile))
+                self.hint_active = False
+                self.hint_tile = None
+
+    def next_wakeup(self):
+        # Seconds until the idle screen next needs an update (the timer
+        # ticking over or a hint expiring), or None to sleep until input
+        wakeups = []
+        if not self.solved:
+            wakeups.append(1 - (time.time() - self.start_time) % 1)
+        if self.hint_active and self.hint_request is None:
+            wakeups.append(max(self.hint_expires - time.time(), 0))
+        return min(wakeups) if wakeups else None
+
+    def screen_rect(self, tile):
+        rect = tile.rect.move(self.board_x - self.view_x, self.board_y - self.view_y)
+        return rect.clip(self.view_rect())
+
+    def hud_lines(self):
+        # (text, anchor, position) for each line of the HUD
+        minutes = int(self.elapsed_time) // 60
+        seconds = int(self.elapsed_time) % 60
+        lines = [
+            (f"Moves: {self.moves}", "topleft", (10, 10)),
+            (f"Time: {minutes:02d}:{seconds:02d}", "topleft", (10, 50)),
+            (f"Distance: {self.distance_to_goal()}", "topleft", (10, 90)),
+            (f"Difficulty: {self.grid_size}x{self.grid_size}", "topright", (SCREEN_WIDTH - 10, 10)),
+            (f"Image: {self.image_choice}", "topright", (SCREEN_WIDTH - 10, 50)),
+        ]
+        if self.optimal_length is not None:
+            lines.append((f"Optimal: {self.optimal_length}", "topright", (SCREEN_WIDTH - 10, 90)))
+        return lines
+
+    def dirty_rects(self):
+        # Screen areas changed since the last call: moved tiles, hint
+        # highlights and HUD lines whose text changed
+        rects = self.dirty
+        self.dirty = []
+        for i, (text, anchor, position) in enumerate(self.hud_lines()):
+            drawn = self.hud_drawn.get(i)
+            if drawn is None or drawn[0] != text:
+                rect = render_text(text, 36, BLACK).get_rect(**{anchor: position})
+                rects.append(rect.union(drawn[1]) if drawn else rect)
+                self.hud_drawn[i] = (text, rect)
+        return rects
+
+    def draw(self):
+        # Draw background for the board, keeping everything inside the view
+        view = self.view_rect()
+        clip = screen.get_clip()
+        area = clip.clip(view)
+        screen.set_clip(area)
+        pygame.draw.rect(screen, GRAY, view)
+
+        # Draw the visible tiles in one batched blit of their sprites
+        sprites = self.sprites
+        offset_x = self.board_x - self.view_x
+        offset_y = self.board_y - self.view_y
+        screen.blits([(sprites[tile.value], (tile.rect.x + offset_x, tile.rect.y + offset_y))
+                      for tile in self.visible_tiles(area)], doreturn=False)
+
+        # Highlight hint tile
+        if self.hint_active and self.hint_tile:
+            pygame.draw.rect(screen, (255, 255, 0), self.hint_tile.rect.move(offset_x, offset_y), 4)
+        screen.set_clip(clip)
+
+        # Draw moves counter, timer, distance, difficulty and image type
+        for text, anchor, position in self.hud_lines():
+            text_surface = render_text(text, 36, BLACK)
+            screen.blit(text_surface, text_surface.get_rect(**{anchor: position}))
+
+        # Draw solved message
+        if self.solved:
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 128))
+            screen.blit(overlay, (0, 0))
+
+            solved_text = render_text("SOLVED!", 72, GREEN)
+            text_rect = solved_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+            screen.blit(solved_text, text_rect)
+
+            # Format time as minutes:seconds
+            minutes = int(self.elapsed_time) // 60
+            seconds = int(self.elapsed_time) % 60
+            stats_text = render_text(f"Moves: {self.moves}   Time: {minutes:02d}:{seconds:02d}", 36, WHITE)
+            stats_rect = stats_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
+            screen.blit(stats_text, stats_rect)
+
+class Button:
+    def __init__(self, x, y, width, height, text, color=BLUE, hover_color=None):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.hover_color = hover_color or (min(color[0] + 50, 255), min(color[1] + 50, 255), min(color[2] + 50, 255))
+        self.is_hovered = False
+        self.dirty = False  # Hover state changed since the button was last drawn
+
+    def draw(self):
+        color = self.hover_color if self.is_hovered else self.color
+        pygame.draw.rect(screen, color, self.rect, border_radius=5)
+        pygame.draw.rect(screen, BLACK, self.rect, 2, border_radius=5)
+
+        text = render_text(self.text, 28, WHITE)
+        text_rect = text.get_rect(center=self.rect.center)
+        screen.blit(text, text_rect)
+
+    def check_hover(self, pos):
+        hovered = bool(self.rect.collidepoint(pos))
+        if hovered != self.is_hovered:
+            self.is_hovered = hovered
+            self.dirty = True
+        return self.is_hovered
+
+    def is_clicked(self, pos):
+        return self.rect.collidepoint(pos)
+
+class Menu:
+    def __init__(self):
+        self.state = "main"  # main, game, difficulty, image_select
+        self.game = None
+        self.difficulty = 3
+        self.image_choice = "Numbers"
+        self.drawn = None  # (state, game) of the last full redraw
+        self.pool = PuzzlePool()  # Pre-generated scrambles, filled by main()
+
+        # Create buttons for main menu
+        button_width = 200
+        button_height = 50
+        center_x = SCREEN_WIDTH // 2 - button_width // 2
+
+        self.main_buttons = [
+            Button(center_x, 200, button_width, button_height, "Start Game"),
+            Button(center_x, 270, button_width, button_height, "Select Difficulty"),
+            Button(center_x, 340, button_width, button_height, "Select Image"),
+            Button(center_x, 410, button_width, button_height, "Quit")
+        ]
+
+        self.difficulty_buttons = [
+            Button(center_x, 200, button_width, button_height, "Easy (3x3)", GREEN),
+            Button(center_x, 270, button_width, button_height, "Medium (4x4)", BLUE),
+            Button(center_x, 340, button_width, button_height, "Hard (5x5)", RED),
+            Button(center_x, 410, button_width, button_height, self.large_label(LARGE_GRIDS[0]), PURPLE),
+            Button(center_x, 480, button_width, button_height, "Back")
+        ]
+
+        self.image_buttons = []
+        y_pos = 200
+        for image in sample_images:
+            self.image_buttons.append(Button(center_x, y_pos, button_width, button_height, image["name"]))
+            y_pos += 70
+        self.image_buttons.append(Button(center_x, y_pos, button_width, button_height, "Back"))
+
+        self.game_buttons = [
+            Button(center_x - 110, SCREEN_HEIGHT - 70, button_width - 40, button_height, "Restart"),
+            Button(center_x + 70, SCREEN_HEIGHT - 70, button_width - 40, button_height, "Menu"),
+            Button(SCREEN_WIDTH - 100, SCREEN_HEIGHT - 70, 80, button_height, "Hint")
+        ]
+
+    def large_label(self, grid_size):
+        return f"Large ({grid_size}x{grid_size})"
+
+    def new_game(self):
+        # Take a ready-made scramble from the pool when one is available; it
+        # is drawn like a fresh shuffle and comes with its optimal length
+        if self.game:
+            self.game.cancel_hint()
+            self.game.close_log()
+        puzzle = self.pool.pop(self.difficulty)
+        if puzzle:
+            cells, length = puzzle
+            self.game = PuzzleGame(self.difficulty, self.image_choice, cells=cells, optimal_length=length)
+        else:
+            self.game = PuzzleGame(self.difficulty, self.image_choice)
+        if RECORD_GAMES:
+            self.game.record()
+
+    def resume_game(self):
+        # Pick up the newest unfinished recorded game (after a crash or a
+        # quit mid-game); returns False if there is none
+        path = latest_unfinished()
+        if path is None:
+            return False
+        try:
+            with Replay(path) as replay:
+                cells = list(replay.board_at(replay.moves).cells)
+            log = MoveLog.reopen(path)
+        except (OSError, ValueError):
+            return False
+        self.difficulty = log.grid_size
+        self.image_choice = log.image_choice
+        if self.game:
+            self.game.cancel_hint()
+        self.game = PuzzleGame(log.grid_size, log.image_choice, cells=cells)
+        self.game.resume(log)
+        self.state = "game"
+        return True
+
+    def leave_game(self):
+        # Back to the main menu; nothing waits on a hint for the game left
+        if self.game:
+            self.game.cancel_hint()
+        self.state = "main"
+
+    def handle_event(self, event):
+        if event.type == HINT_EVENT:
+            if self.game:
+                self.game.receive_hint(event.request, event.move, event.final, event.moves)
+            return True
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            pos = pygame.mouse.get_pos()
+
+            if self.state == "main":
+                for i, button in enumerate(self.main_buttons):
+                    if button.is_clicked(pos):
+                        if i == 0:  # Start Game
+                            self.new_game()
+                            self.state = "game"
+                        elif i == 1:  # Select Difficulty
+                            self.state = "difficulty"
+                        elif i == 2:  # Select Image
+                            self.state = "image_select"
+                        elif i == 3:  # Quit
+                            return False
+
+            elif self.state == "difficulty":
+                for i, button in enumerate(self.difficulty_buttons):
+                    if button.is_clicked(pos):
+                        if i == 0:  # Easy
+                            self.difficulty = 3
+                            self.state = "main"
+                        elif i == 1:  # Medium
+                            self.difficulty = 4
+                            self.state = "main"
+                        elif i == 2:  # Hard
+                            self.difficulty = 5
+                            self.state = "main"
+                        elif i == 3:  # Large: each click picks the next size
+                            if self.difficulty in LARGE_GRIDS:
+                                index = LARGE_GRIDS.index(self.difficulty) + 1
+                                self.difficulty = LARGE_GRIDS[index % len(LARGE_GRIDS)]
+                            else:
+                                self.difficulty = LARGE_GRIDS[0]
+                            button.text = self.large_label(self.difficulty)
+                            button.dirty = True
+                        elif i == 4:  # Back
+                            self.state = "main"
+
+            elif self.state == "image_select":
+                for i, button in enumerate(self.image_buttons):
+                    if button.is_clicked(pos):
+                        if i < len(sample_images):  # Image selection
+                            self.image_choice = sample_images[i]["name"]
+                            self.state = "main"
+                        else:  # Back button
+                            self.state = "main"
+
+            elif self.state == "game":
+                # Check game buttons
+                for i, button in enumerate(self.game_buttons):
+                    if button.is_clicked(pos):
+                        if i == 0:  # Restart
+                            self.new_game()
+                        elif i == 1:  # Menu
+                            self.leave_game()
+                        elif i == 2:  # Hint
+                            self.game.show_hint()
+
+                # Check tile clicks
+                if self.game:
+                    cell = self.game.cell_at(pos)
+                    if cell:
+                        self.game.move_tile(*cell)
+
+        elif self.state == "game" and self.game:
+            # Zoom with the mouse wheel and scroll with the arrow keys on
+            # boards larger than the view
+            if event.type == pygame.MOUSEWHEEL:
+                self.game.zoom(event.y)
+            elif event.type == pygame.KEYDOWN and event.key in SCROLL_KEYS:
+                dx, dy = SCROLL_KEYS[event.key]
+                step = self.game.view_size // 4
+                self.game.scroll(dx * step, dy * step)
+
+        return True
+
+    def is_animating(self):
+        return self.state == "game" and self.game is not None and bool(self.game.animating)
+
+    def next_wakeup(self):
+        if self.state == "game" and self.game:
+            return self.game.next_wakeup()
+        return None
+
+    def update(self, dt):
+        mouse_pos = pygame.mouse.get_pos()
+
+        if self.state == "main":
+            for button in self.main_buttons:
+                button.check_hover(mouse_pos)
+        elif self.state == "difficulty":
+            for button in self.difficulty_buttons:
+                button.check_hover(mouse_pos)
+        elif self.state == "image_select":
+            for button in self.image_buttons:
+                button.check_hover(mouse_pos)
+        elif self.state == "game" and self.game:
+            self.game.update(dt)
+            for button in self.game_buttons:
+                button.check_hover(mouse_pos)
+
+    def current_buttons(self):
+        if self.state == "main":
+            return self.main_buttons
+        elif self.state == "difficulty":
+            return self.difficulty_buttons
+        elif self.state == "image_select":
+            return self.image_buttons
+        elif self.state == "game" and self.game:
+            return self.game_buttons
+        return []
+
+    def draw(self):
+        # Redraw what changed since the last frame and return the screen
+        # rects that need pushing to the display (empty when idle)
+        game = self.game if self.state == "game" else None
+        buttons = self.current_buttons()
+        if not DIRTY_RECTS or self.drawn != (self.state, game) or (game and game.full_redraw):
+            self.drawn = (self.state, game)
+            if game:
+                game.full_redraw = False
+                game.dirty_rects()
+            for button in buttons:
+                button.dirty = False
+            self.draw_scene()
+            return [screen.get_rect()]
+
+        rects = []
+        for button in buttons:
+            if button.dirty:
+                button.dirty = False
+                rects.append(button.rect)
+        if game:
+            rects.extend(game.dirty_rects())
+
+        # Repaint the whole scene, clipped to each changed area
+        for rect in rects:
+            screen.set_clip(rect)
+            self.draw_scene()
+        screen.set_clip(None)
+        return rects
+
+    def draw_scene(self):
+        screen.fill(WHITE)
+
+        if self.state == "main":
+            # Draw title
+            title = render_text("Sliding Puzzle", 72, BLACK)
+            title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
+            screen.blit(title, title_rect)
+
+            # Draw current settings
+            settings = render_text(f"Difficulty: {self.difficulty}x{self.difficulty}   Image: {self.image_choice}", 28, BLACK)
+            settings_rect = settings.get_rect(center=(SCREEN_WIDTH // 2, 150))
+            screen.blit(settings, settings_rect)
+
+            # Draw buttons
+            for button in self.main_buttons:
+                button.draw()
+
+        elif self.state == "difficulty":
+            title = render_text("Select Difficulty", 72, BLACK)
+            title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
+            screen.blit(title, title_rect)
+
+            for button in self.difficulty_buttons:
+                button.draw()
+
+        elif self.state == "image_select":
+            title = render_text("Select Image", 72, BLACK)
+            title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
+            screen.blit(title, title_rect)
+
+            for button in self.image_buttons:
+                button.draw()
+
+        elif self.state == "game" and self.game:
+            self.game.draw()
+
+            # Draw game buttons
+            for button in self.game_buttons:
+                button.draw()
+
+def draw_profile_overlay():
+    # Rolling frame-time stats in the top-left corner; returns the rect drawn.
+    # Text goes straight through the font, since the numbers change every
+    # frame and would only churn the text cache
+    stats = profiler.summary()
+    lines = [
+        f"frame p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f} ms",
+        "  ".join(f"{phase} {stats[phase]:.2f}" for phase in ("events", "update", "draw", "display")),
+        f"{stats['frames']} frames" + ("  (profiling)" if profiler.profile else ""),
+    ]
+    if hint_cache is not None:
+        lines.append(format_cache_stats(hint_cache.stats()))
+    font = get_font(20)
+    rendered = [font.render(line, True, GREEN) for line in lines]
+    rect = pygame.Rect(0, 0, max(360, 12 + max(text.get_width() for text in rendered)), 8 + 18 * len(lines))
+    pygame.draw.rect(screen, BLACK, rect)
+    for i, text in enumerate(rendered):
+        screen.blit(text, (6, 4 + 18 * i))
+    return rect
+
+def format_cache_stats(stats):
+    return (f"hint cache {stats['entries']} entries  hit rate {stats['hit_rate']:.0%}  "
+            f"({stats['disk_hits']} from disk, {stats['evictions']} evicted)")
+
+def export_profile():
+    if not profiler.trace:
+        print("No frames recorded yet; press F3 to start the profiler before exporting")
+        return
+    os.makedirs(cache_dir(), exist_ok=True)
+    base = os.path.join(cache_dir(), time.strftime("frames-%Y%m%d-%H%M%S"))
+    for extension in (".csv", ".json"):
+        profiler.export(base + extension)
+    print(f"Frame trace written to {base}.csv and {base}.json")
+
+def init_display(headless=False):
+    # Initialize pygame and open the window on first use, so importing this
+    # module stays cheap; headless mode uses SDL's dummy video driver
+    global screen
+    if screen is None:
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Enhanced Sliding Puzzle")
+    return screen
+
+def main():
+    global profile_overlay
+    init_display()
+    clock = pygame.time.Clock()
+
+    # Create menu
+    menu = Menu()
+    menu.pool.start()
+    if RECORD_GAMES:
+        menu.resume_game()
+
+    # Game loop
+    running = True
+    while running:
+        profiler.start_frame()
+        if menu.is_animating():
+            # Run at full frame rate only while tiles are moving
+            dt = clock.tick(FPS) / 1000
+            events = pygame.event.get()
+        else:
+            # Idle: block until input arrives or the screen next needs updating
+            wakeup = menu.next_wakeup()
+            event = pygame.event.wait(max(1, int(wakeup * 1000)) if wakeup is not None else 0)
+            events = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+            # The wait is not animation time: a slide started by this frame's
+            # click must begin from its first step, not jump a whole wait ahead
+            dt = min(clock.tick() / 1000, 1 / FPS)
+        profiler.mark("wait")
+
+        # Process input (events)
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    if menu.state == "game":
+                        menu.leave_game()
+                    else:
+                        running = False
+                elif event.key == pygame.K_F3:
+                    profile_overlay = not profile_overlay
+                    profiler.enable(profile_overlay)
+                    menu.drawn = None  # Repaint what the overlay covered
+                elif event.key == pygame.K_F4:
+                    export_profile()
+                elif event.key == pygame.K_F5:
+                    profiler.start_profile(PROFILE_FRAMES)
+
+            # Let menu handle other events
+            if not menu.handle_event(event):
+                running = False
+
+        profiler.mark("events")
+
+        # Update
+        menu.update(dt)
+        profiler.mark("update")
+
+        # Draw / render
+        dirty = menu.draw()
+        if profile_overlay:
+            dirty.append(draw_profile_overlay())
+        profiler.mark("draw")
+
+        # Push only the changed parts of the screen to the display
+        if dirty:
+            pygame.display.update(dirty)
+        profiler.mark("display")
+
+        stats = profiler.end_frame()
+        if stats is not None:
+            print(format_stats(stats))
+
+    menu.pool.stop()
+    if menu.game:
+        menu.game.close_log()
+    if hint_worker is not None:
+        hint_worker.stop()
+    if hint_cache is not None:
+        print(format_cache_stats(hint_cache.stats()))
+        hint_cache.close()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+
+from . import game
+
+# Runs simulated games through PuzzleGame without a window, e.g. on CI
+# machines with no display. Rendering (optional) goes to SDL's dummy driver.
+
+
+def simulate(grid_size=3, games=1000, max_moves=200, policy="random", image_choice="Numbers", render=False,
+             seed=None, persist_hints=False):
+    # Returns a dict of totals for the batch; a seed makes the whole batch
+    # (scrambles and random moves) reproducible. Hints solved along the way
+    # stay in memory unless `persist_hints` shares the player's hint cache.
+    game.PERSIST_HINTS = persist_hints
+    if render:
+        game.init_display(headless=True)
+    rng = random.Random(seed)
+
+    moves = solved = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        puzzle = game.PuzzleGame(grid_size, image_choice, seed=rng.getrandbits(64))
+        for _ in range(max_moves):
+            if policy == "hint":
+                x, y = puzzle.next_hint_move()
+            else:
+                cell = rng.choice(puzzle.board.movable_cells())
+                x, y = cell % grid_size, cell // grid_size
+            puzzle.move_tile(x, y)
+            if puzzle.solved:
+                break
+
+        if render:
+            # Let the last slide finish, then draw one frame
+            puzzle.update(1)
+            puzzle.draw()
+
+        moves += puzzle.moves
+        solved += puzzle.solved
+    seconds = time.perf_counter() - start
+
+    return {
+        "games": games,
+        "solved": solved,
+        "moves": moves,
+        "seconds": seconds,
+        "games_per_second": games / seconds if seconds else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run simulated sliding-puzzle games without a display")
+    parser.add_argument("--grid", type=int, default=3, help="grid size (default: %(default)s)")
+    parser.add_argument("--games", type=int, default=1000, help="number of games (default: %(default)s)")
+    parser.add_argument("--max-moves", type=int, default=200, help="move cap per game (default: %(default)s)")
+    parser.add_argument("--policy", choices=["random", "hint"], default="random",
+                        help="how moves are chosen (default: %(default)s)")
+    parser.add_argument("--image", default="Numbers", choices=[image["name"] for image in game.sample_images])
+    parser.add_argument("--render", action="store_true", help="draw each finished game with the dummy driver")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument("--persist-hints", action="store_true",
+                        help="read and write the on-disk hint cache instead of a private in-memory one")
+    args = parser.parse_args(argv)
+
+    result = simulate(args.grid, args.games, args.max_moves, args.policy, args.image, args.render, args.seed,
+                      args.persist_hints)
+    if game.hint_cache is not None:
+        game.hint_cache.close()  # Flush hints still queued for the disk
+    print(f"{result['games']} games, {result['solved']} solved, {result['moves']} moves "
+          f"in {result['seconds']:.2f}s ({result['games_per_second']:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import multiprocessing
+import threading
+
+from .solver import SearchCancelled, SearchLimitError, get_solver
+
+# Hint search off the render loop.
+#
+# Searches run in a separate process, so they never hold the game's GIL.
+# Each request gets a new generation number; bumping the shared generation
+# cancels whatever search is in flight. Results (partial best-so-far moves
+# while IDA* deepens, then the final optimal move) come back on a listener
+# thread and are handed to `deliver(request_id, move, final, moves)`, where
+# `moves` is the full optimal solution on the final result. A search given a
+# node budget that runs out ends with a final result of no move and no moves.
+
+
+def _search(requests, results, generation):
+    while True:
+        item = requests.get()
+        if item is None:
+            break
+        request_id, grid_size, cells, max_nodes = item
+        if generation.value != request_id:
+            continue  # Superseded before it started
+
+        def cancel():
+            return generation.value != request_id
+
+        def progress(move):
+            results.put((request_id, move, False, None))
+
+        try:
+            moves = get_solver(grid_size).solve(cells, max_nodes, cancel=cancel, progress=progress)
+        except SearchCancelled:
+            continue
+        except SearchLimitError:
+            results.put((request_id, None, True, None))
+            continue
+        results.put((request_id, moves[0] if moves else None, True, moves))
+
+
+class HintWorker:
+    def __init__(self, deliver):
+        self.deliver = deliver
+        self.process = None
+        self.listener = None
+
+    def start(self):
+        # Spawned lazily on the first request; "spawn" keeps the child free
+        # of the parent's pygame and thread state
+        if self.process is None:
+            context = multiprocessing.get_context("spawn")
+            self.requests = context.Queue()
+            self.results = context.Queue()
+            self.generation = context.Value("q", 0, lock=False)
+            self.process = context.Process(target=_search, args=(self.requests, self.results, self.generation),
+                                           name="puzzle-hints", daemon=True)
+            self.process.start()
+            self.listener = threading.Thread(target=self.listen, name="puzzle-hints-listener", daemon=True)
+            self.listener.start()
+
+    def listen(self):
+        while True:
+            item = self.results.get()
+            if item is None:
+                break
+            self.deliver(*item)
+
+    def request(self, grid_size, cells, max_nodes=None):
+        # Starts a search (cancelling any other) and returns its request id
+        self.start()
+        self.generation.value += 1
+        request_id = self.generation.value
+        self.requests.put((request_id, grid_size, list(cells), max_nodes))
+        return request_id
+
+    def cancel(self):
+        if self.process is not None:
+            self.generation.value += 1
+
+    def stop(self):
+        if self.process is not None:
+            self.cancel()
+            self.requests.put(None)
+            self.results.put(None)
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.listener.join(timeout=1)
+            self.process = None
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .board import Board
+from .server import Client, serve
+
+# Load test for the puzzle server.
+#
+# Opens `sessions` games spread over `connections` connections, then runs
+# `players` concurrent players for `duration` seconds. Each player cycles
+# through its share of the sessions, sending one random legal move at a time
+# and timing it until the reply arrives. Every connection also watches a few
+# other sessions, so batched delta broadcasts are part of the load. Without
+# --connect, a server is started in a separate process on a free port.
+#
+# One Python client process tops out well below the server, so the load is
+# split over several client processes and their results merged.
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_load(host, port, connections=50, sessions=20000, players=1000, duration=10.0, grid_size=4,
+                   watch=4, seed=None):
+    rng = random.Random(seed)
+    deltas = [0]
+
+    def on_deltas(items):
+        deltas[0] += len(items)
+
+    clients = [await Client.connect(host, port, on_deltas) for _ in range(connections)]
+
+    # Open the sessions in batches, so the socket buffers stay small
+    games = []  # (client, session id, Board)
+    for start in range(0, sessions, 1000):
+        batch = [clients[i % connections] for i in range(start, min(start + 1000, sessions))]
+        replies = await asyncio.gather(*(client.request("new", grid=grid_size) for client in batch))
+        for client, reply in zip(batch, replies):
+            games.append((client, reply["session"], Board(grid_size, reply["cells"])))
+    for client in clients:
+        for _, session_id, _ in rng.sample(games, min(watch, len(games))):
+            await client.request("watch", session=session_id)
+
+    latencies = array("d")
+    rejected = [0]
+    deadline = time.perf_counter() + duration
+
+    async def play(share, player_rng):
+        previous = {}
+        while share and time.perf_counter() < deadline:
+            for client, session_id, board in share:
+                cells = [cell for cell in board.movable_cells() if cell != previous.get(session_id)]
+                cell = player_rng.choice(cells)
+                started = time.perf_counter()
+                reply = await client.request("move", session=session_id, x=cell % grid_size, y=cell // grid_size)
+                latencies.append(time.perf_counter() - started)
+                if reply.get("ok"):
+                    previous[session_id] = board.empty_index
+                    board.move_index(cell)
+                else:
+                    rejected[0] += 1  # The server disagreed with our copy of the board
+                if time.perf_counter() >= deadline:
+                    break
+
+    players = max(1, min(players, len(games)))
+    started = time.perf_counter()
+    await asyncio.gather(*(play(games[i::players], random.Random(rng.getrandbits(64))) for i in range(players)))
+    seconds = time.perf_counter() - started
+
+    for client in clients:
+        await client.close()
+    return {
+        "sessions": len(games),
+        "connections": connections,
+        "players": players,
+        "seconds": seconds,
+        "latencies": latencies,
+        "rejected": rejected[0],
+        "deltas_received": deltas[0],
+    }
+
+
+def _run_process(host, port, *args):
+    return asyncio.run(run_load(host, port, *args))
+
+
+def run_processes(host, port, processes, connections, sessions, players, duration, grid_size, watch, seed):
+    # Splits the load over client processes and merges their results
+    rng = random.Random(seed)
+    share = lambda total, i: total // processes + (i < total % processes)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(processes, mp_context=context) as pool:
+        futures = [pool.submit(_run_process, host, port, max(1, share(connections, i)), share(sessions, i),
+                               share(players, i), duration, grid_size, watch, rng.getrandbits(64))
+                   for i in range(processes)]
+        results = [future.result() for future in futures]
+
+    latencies = array("d")
+    for result in results:
+        latencies.extend(result["latencies"])
+    seconds = max(result["seconds"] for result in results)
+    return {
+        "sessions": sum(result["sessions"] for result in results),
+        "connections": sum(result["connections"] for result in results),
+        "players": sum(result["players"] for result in results),
+        "moves": len(latencies),
+        "seconds": seconds,
+        "moves_per_second": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "rejected": sum(result["rejected"] for result in results),
+        "deltas_received": sum(result["deltas_received"] for result in results),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the sliding-puzzle server")
+    parser.add_argument("--connect", help="HOST:PORT of a running server (default: start one)")
+    parser.add_argument("--connections", type=int, default=50, help="client connections (default: %(default)s)")
+    parser.add_argument("--sessions", type=int, default=20000, help="sessions opened (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=1000,
+                        help="concurrent players, each with one move in flight (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of play (default: %(default)s)")
+    parser.add_argument("--grid", type=int, default=4, help="grid size (default: %(default)s)")
+    parser.add_argument("--watch", type=int, default=4, help="sessions watched per connection (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="client processes generating the load (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        port = int(port)
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = multiprocessing.get_context("spawn").Process(target=serve, args=(host, port), daemon=True)
+        server.start()
+        for _ in range(100):  # Wait for it to listen
+            try:
+                socket.create_connection((host, port)).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+
+    try:
+        result = run_processes(host, port, args.processes, args.connections, args.sessions, args.players,
+                               args.duration, args.grid, args.watch, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+
+    print(f"{result['sessions']} sessions over {result['connections']} connections, {result['players']} players")
+    print(f"{result['moves']} moves in {result['seconds']:.1f}s ({result['moves_per_second']:.0f} moves/s), "
+          f"latency p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    print(f"{result['rejected']} moves rejected, {result['deltas_received']} deltas received")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .solver import SearchCancelled, get_solver
+
+# Multi-core IDA* for 5x5 and larger boards.
+#
+# Each deepening pass expands the search tree breadth-first in this process
+# until there are enough independent subtrees to keep every core busy, then
+# searches the subtrees in a process pool under the same bound. The first
+# subtree to reach the goal holds an optimal solution (nothing was found at
+# any lower bound), so it raises a shared stop flag and the other workers
+# abandon their subtrees within CANCEL_CHECK nodes.
+
+TASKS_PER_WORKER = 8  # Subtrees per core, so uneven subtrees still balance out
+MAX_SPLIT_DEPTH = 12
+
+_stop = None
+
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def _search_subtree(grid_size, cells, g, prev, bound):
+    # Runs in a worker: one pass over a subtree, returning
+    # (cells slid or None, next bound, nodes expanded)
+    solver = get_solver(grid_size)
+    solver.nodes = 0
+    try:
+        path, next_bound = solver.search(cells, g, prev, bound, passes=1, cancel=lambda: _stop.value)
+    except SearchCancelled:
+        return None, float("inf"), solver.nodes
+    return (list(path) if path is not None else None), next_bound, solver.nodes
+
+
+class ParallelSolver:
+    def __init__(self, grid_size, workers=None):
+        self.grid_size = grid_size
+        self.workers = workers or os.cpu_count() or 1
+        self.solver = get_solver(grid_size)
+        self.nodes = 0
+        context = multiprocessing.get_context("spawn")
+        self.stop = context.Value("b", 0, lock=False)
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                        initializer=_init_worker, initargs=(self.stop,))
+
+    def split(self, cells, bound):
+        # Frontier of (cells, path so far, previous empty cell) under `bound`,
+        # plus the smallest f that exceeded it; returns a path instead if the
+        # goal is within reach of the frontier itself
+        solver = self.solver
+        frontier = [(list(cells), [], -1)]
+        next_bound = float("inf")
+        for depth in range(MAX_SPLIT_DEPTH):
+            if len(frontier) >= self.workers * TASKS_PER_WORKER:
+                break
+            expanded = []
+            for node_cells, path, prev in frontier:
+                empty = node_cells.index(0)
+                for tile in solver.neighbors[empty]:
+                    if tile == prev:
+                        continue
+                    child = list(node_cells)
+                    child[empty], child[tile] = child[tile], 0
+                    h = solver.heuristic(child)
+                    if h == 0:
+                        return None, None, path + [tile]
+                    f = depth + 1 + h
+                    if f > bound:
+                        next_bound = min(next_bound, f)
+                    else:
+                        expanded.append((child, path + [tile], empty))
+            self.nodes += len(frontier)
+            frontier = expanded
+        return frontier, next_bound, None
+
+    def solve(self, cells):
+        # Same result format as Solver.solve
+        self.solver.check(cells)
+        n = self.grid_size
+        self.nodes = 0
+        bound = self.solver.heuristic(cells)
+        if bound == 0:
+            return []
+        while True:
+            frontier, next_bound, path = self.split(cells, bound)
+            if path is not None:
+                return [(i % n, i // n) for i in path]
+
+            self.stop.value = 0
+            pending = {self.pool.submit(_search_subtree, n, child, len(prefix), prev, bound): prefix
+                       for child, prefix, prev in frontier}
+            solution = None
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prefix = pending.pop(future)
+                    subtree_path, subtree_bound, nodes = future.result()
+                    self.nodes += nodes
+                    if subtree_path is not None and solution is None:
+                        solution = prefix + subtree_path
+                        self.stop.value = 1  # Optimal: cancel the other subtrees
+                    next_bound = min(next_bound, subtree_bound)
+
+            if solution is not None:
+                return [(i % n, i // n) for i in solution]
+            bound = next_bound
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def solve_parallel(cells, grid_size, workers=None):
+    with ParallelSolver(grid_size, workers) as solver:
+        return solver.solve(cells)
@@ -0,0 +1,11 @@
+import os
+
+# Where generated files live: pattern databases, the 3x3 distance table, the
+# puzzle pool, the hint cache, recordings and profiler traces. Set
+# PUZZLE_CACHE_DIR to move them out of the checkout.
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+
+
+def cache_dir():
+    return os.environ.get("PUZZLE_CACHE_DIR", DEFAULT_CACHE_DIR)
@@ -0,0 +1,258 @@
+import argparse
+import mmap
+import os
+from array import array
+from itertools import permutations
+
+from .paths import cache_dir
+
+# Disjoint additive pattern databases.
+#
+# Each pattern is a group of tiles; its table maps every placement of those
+# tiles to the fewest moves *of pattern tiles* needed to bring them home.
+# Because groups are disjoint, their values add up to an admissible heuristic.
+#
+# A pattern's cost always has the same parity as its tiles' Manhattan sum, so
+# the tables store the excess over Manhattan in pairs of moves:
+#     cost = manhattan(pattern tiles) + 2 * excess
+# which fits a 4-bit nibble (capped at 15, which keeps it admissible).
+#
+# Tables are built once offline (python -m puzzle.pdb --grid 4) and memory-
+# mapped read-only at runtime, so several game processes share the pages.
+
+MAX_EXCESS = 15
+
+DEFAULT_PATTERNS = {
+    4: [
+        (1, 5, 6, 9, 10, 13),
+        (7, 8, 11, 12, 14, 15),
+        (2, 3, 4),
+    ],
+    5: [
+        (1, 2, 3, 6, 7, 8),
+        (4, 5, 9, 10, 14, 15),
+        (11, 12, 16, 17, 21, 22),
+        (13, 18, 19, 20, 23, 24),
+    ],
+}
+
+def table_path(grid_size, tiles, directory=None):
+    name = "pdb-{}-{}.bin".format(grid_size, ".".join(str(tile) for tile in tiles))
+    return os.path.join(directory or cache_dir(), name)
+
+
+def placement_count(size, k):
+    count = 1
+    for i in range(k):
+        count *= size - i
+    return count
+
+
+def rank(positions, size):
+    # Mixed-radix rank of a placement of distinct cells: each position is
+    # counted among the cells not already taken by earlier tiles, which a
+    # bitmask of the taken cells answers with one popcount
+    r = 0
+    taken = 0
+    for i, p in enumerate(positions):
+        r = r * (size - i) + p - (taken & ((1 << p) - 1)).bit_count()
+        taken |= 1 << p
+    return r
+
+
+def unrank(r, size, k):
+    digits = []
+    for i in range(k - 1, -1, -1):
+        r, digit = divmod(r, size - i)
+        digits.append(digit)
+    digits.reverse()
+
+    positions = []
+    taken = 0
+    for adj in digits:
+        # The free cell with `adj` free cells below it: step past taken cells
+        # until the count settles
+        p = adj
+        while True:
+            q = adj + (taken & ((2 << p) - 1)).bit_count()
+            if q == p:
+                break
+            p = q
+        positions.append(p)
+        taken |= 1 << p
+    return positions
+
+
+def _neighbors(grid_size):
+    n = grid_size
+    result = []
+    for i in range(n * n):
+        x, y = i % n, i // n
+        cells = []
+        if x > 0:
+            cells.append(i - 1)
+        if x < n - 1:
+            cells.append(i + 1)
+        if y > 0:
+            cells.append(i - n)
+        if y < n - 1:
+            cells.append(i + n)
+        result.append(cells)
+    return result
+
+
+def _flood(reach, free, n, not_left, not_right):
+    # Bitmask of the cells reachable from `reach` through `free` cells; a
+    # whole frontier of bits grows per step
+    while True:
+        grown = (reach | (reach << 1 & not_left) | (reach >> 1 & not_right) | reach << n | reach >> n) & free
+        if grown == reach:
+            return reach
+        reach = grown
+
+
+def build_pattern(grid_size, tiles):
+    # Breadth-first search backwards from the goal over (placement, empty
+    # region) states; moves of non-pattern tiles are free, so the empty cell
+    # is represented by the lowest cell of the region it can wander.
+    n = grid_size
+    size = n * n
+    k = len(tiles)
+    entries = placement_count(size, k)
+    neighbors = _neighbors(n)
+    goal = [tile - 1 for tile in tiles]
+    full = (1 << size) - 1
+    not_left = sum(1 << i for i in range(size) if i % n)
+    not_right = sum(1 << i for i in range(size) if i % n != n - 1)
+
+    cost = bytearray(b"\xff") * entries
+    seen = bytearray((entries * size + 7) // 8)
+    # Place value of each tile's digit in a rank
+    place = [placement_count(size - i - 1, k - i - 1) for i in range(k)]
+
+    start = sum(1 << g for g in goal)
+    region = _flood(1 << size - 1, full & ~start, n, not_left, not_right)
+    state = rank(goal, size) * size + (region & -region).bit_length() - 1
+    seen[state >> 3] |= 1 << (state & 7)
+    frontier = array("Q", [state])
+    depth = 0
+    while frontier:
+        next_frontier = array("Q")
+        for state in frontier:
+            r, empty = divmod(state, size)
+            if cost[r] == 0xFF:
+                cost[r] = min(depth, 0xFE)
+            positions = unrank(r, size, k)
+            below = []  # Cells of the tiles before each tile
+            occupied = 0
+            for p in positions:
+                below.append(occupied)
+                occupied |= 1 << p
+            region = _flood(1 << empty, full & ~occupied, n, not_left, not_right)
+            for i, p in enumerate(positions):
+                earlier = below[i]
+                for nb in neighbors[p]:
+                    if not region >> nb & 1:
+                        continue
+                    # Rank of the child: the moved tile's own digit changes,
+                    # and so does the digit of every later tile it jumps over
+                    child = r + (nb - p - (earlier & ((1 << nb) - 1)).bit_count()
+                                 + (earlier & ((1 << p) - 1)).bit_count()) * place[i]
+                    if nb - p > 1:
+                        for j in range(i + 1, k):
+                            if p < positions[j] < nb:
+                                child += place[j]
+                    elif p - nb > 1:
+                        for j in range(i + 1, k):
+                            if nb < positions[j] < p:
+                                child -= place[j]
+                    # The empty cell ends up where the tile was
+                    region_after = _flood(1 << p, full & ~(occupied ^ (1 << p | 1 << nb)), n, not_left, not_right)
+                    child = child * size + (region_after & -region_after).bit_length() - 1
+                    if not seen[child >> 3] & (1 << (child & 7)):
+                        seen[child >> 3] |= 1 << (child & 7)
+                        next_frontier.append(child)
+        frontier = next_frontier
+        depth += 1
+
+    # Convert raw costs into nibble-packed excess over Manhattan distance;
+    # placements come out of permutations() in rank order
+    distance = [[abs(p % n - g % n) + abs(p // n - g // n) for p in range(size)] for g in goal]
+    packed = bytearray((entries + 1) // 2)
+    for r, positions in enumerate(permutations(range(size), k)):
+        if cost[r] == 0xFF:
+            continue
+        manhattan = 0
+        for d, p in zip(distance, positions):
+            manhattan += d[p]
+        excess = min((cost[r] - manhattan) // 2, MAX_EXCESS)
+        packed[r >> 1] |= excess << ((r & 1) * 4)
+    return packed
+
+
+def generate(grid_size, patterns=None, directory=None, verbose=False):
+    patterns = patterns or DEFAULT_PATTERNS[grid_size]
+    directory = directory or cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    for tiles in patterns:
+        path = table_path(grid_size, tiles, directory)
+        if os.path.exists(path):
+            continue
+        if verbose:
+            print(f"Building pattern {tiles} for {grid_size}x{grid_size}...")
+        packed = build_pattern(grid_size, tiles)
+        # Write then rename so a half-written table is never mapped
+        with open(path + ".tmp", "wb") as f:
+            f.write(packed)
+        os.replace(path + ".tmp", path)
+
+
+class PatternDatabase:
+    def __init__(self, grid_size, patterns, tables):
+        self.grid_size = grid_size
+        self.size = grid_size * grid_size
+        self.patterns = [tuple(tiles) for tiles in patterns]
+        self.tables = tables
+        self.pattern_of = [-1] * self.size  # value -> pattern index
+        for index, tiles in enumerate(self.patterns):
+            for tile in tiles:
+                self.pattern_of[tile] = index
+
+    @classmethod
+    def load(cls, grid_size, patterns=None, directory=None):
+        # Map each table read-only; returns None if any table is missing
+        patterns = patterns or DEFAULT_PATTERNS.get(grid_size)
+        if not patterns:
+            return None
+        tables = []
+        for tiles in patterns:
+            path = table_path(grid_size, tiles, directory)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                tables.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return cls(grid_size, patterns, tables)
+
+    def excess(self, index, pos):
+        # Excess pairs of moves for pattern `index`, with pos[value] -> cell
+        tiles = self.patterns[index]
+        r = rank([pos[tile] for tile in tiles], self.size)
+        return (self.tables[index][r >> 1] >> ((r & 1) * 4)) & 0xF
+
+    def close(self):
+        for table in self.tables:
+            table.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build additive pattern databases for the solver")
+    parser.add_argument("--grid", type=int, action="append", choices=sorted(DEFAULT_PATTERNS),
+                        help="grid size to build (repeatable; default: all)")
+    parser.add_argument("--cache-dir", default=None, help="output directory (default: $PUZZLE_CACHE_DIR or cache/)")
+    args = parser.parse_args(argv)
+    for grid_size in args.grid or sorted(DEFAULT_PATTERNS):
+        generate(grid_size, directory=args.cache_dir, verbose=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import os
+import threading
+from array import array
+
+from .board import goal_cells, is_solvable
+from .paths import cache_dir
+
+# Exact distance-to-goal for every 3x3 state.
+#
+# States are indexed by their Myrvold-Ruskey permutation rank (9! slots, half
+# of them unreachable). Like the pattern databases, each nibble holds the
+# excess over Manhattan distance in pairs of moves:
+#     distance = manhattan + 2 * excess
+# so the whole table is 181,440 bytes. It is built by one breadth-first search
+# on first use and saved to the cache directory for later runs. A cold build
+# takes several seconds, so interactive code starts it with load_in_background
+# and checks ready() instead of calling get_table() directly.
+
+GRID_SIZE = 3
+SIZE = GRID_SIZE * GRID_SIZE
+
+
+def table_path(directory=None):
+    return os.path.join(directory or cache_dir(), f"distance-{GRID_SIZE}x{GRID_SIZE}.bin")
+
+
+def rank(cells):
+    # Myrvold-Ruskey linear-time rank of a permutation of 0..len(cells) - 1
+    perm = list(cells)
+    inverse = [0] * len(perm)
+    for i, value in enumerate(perm):
+        inverse[value] = i
+    digits = []
+    for k in range(len(perm), 1, -1):
+        s = perm[k - 1]
+        j = inverse[k - 1]
+        perm[k - 1], perm[j] = perm[j], perm[k - 1]
+        inverse[s], inverse[k - 1] = inverse[k - 1], inverse[s]
+        digits.append((s, k))
+    r = 0
+    for s, k in reversed(digits):
+        r = s + k * r
+    return r
+
+
+def unrank(r, length=SIZE):
+    perm = list(range(length))
+    for k in range(length, 0, -1):
+        r, s = divmod(r, k)
+        perm[k - 1], perm[s] = perm[s], perm[k - 1]
+    return perm
+
+
+def _manhattan(cells):
+    total = 0
+    for i, value in enumerate(cells):
+        if value:
+            goal = value - 1
+            total += abs(i % GRID_SIZE - goal % GRID_SIZE) + abs(i // GRID_SIZE - goal // GRID_SIZE)
+    return total
+
+
+def _neighbors():
+    result = []
+    for i in range(SIZE):
+        x, y = i % GRID_SIZE, i // GRID_SIZE
+        cells = []
+        if x > 0:
+            cells.append(i - 1)
+        if x < GRID_SIZE - 1:
+            cells.append(i + 1)
+        if y > 0:
+            cells.append(i - GRID_SIZE)
+        if y < GRID_SIZE - 1:
+            cells.append(i + GRID_SIZE)
+        result.append(cells)
+    return result
+
+
+NEIGHBORS = _neighbors()
+
+
+def build_table():
+    count = 1
+    for k in range(2, SIZE + 1):
+        count *= k
+    packed = bytearray((count + 1) // 2)
+    seen = bytearray(count)
+
+    start = goal_cells(GRID_SIZE)
+    frontier = array("L", [rank(start)])
+    seen[frontier[0]] = 1
+    depth = 0
+    while frontier:
+        next_frontier = array("L")
+        for r in frontier:
+            cells = unrank(r)
+            excess = (depth - _manhattan(cells)) // 2
+            if excess > 0xF:
+                raise ValueError("distance excess does not fit in a nibble")
+            packed[r >> 1] |= excess << ((r & 1) * 4)
+
+            empty = cells.index(0)
+            for tile in NEIGHBORS[empty]:
+                cells[empty], cells[tile] = cells[tile], 0
+                child = rank(cells)
+                if not seen[child]:
+                    seen[child] = 1
+                    next_frontier.append(child)
+                cells[tile], cells[empty] = cells[empty], 0
+        frontier = next_frontier
+        depth += 1
+    return packed
+
+
+class DistanceTable:
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def load(cls, directory=None):
+        # Read the saved table, building and saving it first if needed
+        path = table_path(directory)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return cls(f.read())
+
+        data = build_table()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Per process, as the game and the pool factory may both build it
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # A read-only install still gets the in-memory table
+        return cls(bytes(data))
+
+    def distance(self, cells):
+        # Optimal number of moves left; cells must be a solvable 3x3 board
+        r = rank(cells)
+        return _manhattan(cells) + 2 * ((self.data[r >> 1] >> ((r & 1) * 4)) & 0xF)
+
+    def next_move(self, cells):
+        # A tile (x, y) whose slide brings the board one move closer, or None
+        if not is_solvable(cells, GRID_SIZE):
+            return None
+        cells = list(cells)
+        remaining = self.distance(cells)
+        if remaining == 0:
+            return None
+        empty = cells.index(0)
+        for tile in NEIGHBORS[empty]:
+            cells[empty], cells[tile] = cells[tile], 0
+            closer = self.distance(cells) < remaining
+            cells[tile], cells[empty] = cells[empty], 0
+            if closer:
+                return tile % GRID_SIZE, tile // GRID_SIZE
+        return None
+
+
+_table = None
+_lock = threading.Lock()
+_loader = None
+
+
+def get_table():
+    # Built or loaded lazily on first use; blocks while another thread does it
+    global _table
+    if _table is None:
+        with _lock:
+            if _table is None:
+                _table = DistanceTable.load()
+    return _table
+
+
+def ready():
+    return _table is not None
+
+
+def load_in_background():
+    # Starts loading (or building) the table on a daemon thread, once
+    global _loader
+    with _lock:
+        if _table is None and _loader is None:
+            _loader = threading.Thread(target=get_table, name="puzzle-distance-table", daemon=True)
+            _loader.start()
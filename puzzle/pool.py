@@ -0,0 +1,221 @@
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from . import perfect
+from .board import Board, is_solvable
+from .paths import cache_dir
+from .pdb import PatternDatabase
+from .solver import SearchLimitError, Solver
+
+# Ready-made scrambles labelled with their exact optimal solution length.
+#
+# A factory process keeps a bounded pool of uniform random scrambles (the
+# same distribution as Board.shuffle) per grid size, so starting or
+# restarting a game pops a puzzle in O(1), and the game can show how many
+# moves the puzzle really needs. The searches run at low priority in their
+# own process, never on the game's threads; a listener thread in the game
+# only hands the factory its next grid size and stores what comes back. The
+# pool is saved to the cache directory, so a cold start has puzzles ready.
+#
+# Grid sizes that keep failing to label, or that cannot be labelled at all
+# (4x4 and 5x5 without pattern databases), are given up on for the session.
+
+POOL_CAPACITY = 20  # Puzzles kept per grid size
+POOL_NODE_LIMIT = 2000000  # Search nodes spent labelling one scramble
+SAVE_INTERVAL = 30  # Seconds between saves while the factory is adding puzzles
+MAX_FAILURES = 5  # Failed labels in a row before a grid size is given up
+FACTORY_NICENESS = 10  # Scheduling priority drop for the factory process
+
+GRID_SIZES = (3, 4, 5)
+
+
+def pool_path(directory=None):
+    return os.path.join(directory or cache_dir(), "pool.json")
+
+
+def valid_puzzle(grid_size, puzzle):
+    # Whether a loaded [cells, length] entry is a solvable board of this size
+    # with a plausible length; anything else in the file is skipped
+    try:
+        cells, length = puzzle
+        return (isinstance(length, int) and length > 0 and sorted(cells) == list(range(grid_size * grid_size))
+                and is_solvable(cells, grid_size))
+    except (TypeError, ValueError):
+        return False
+
+
+def generate(grid_size, rng, solver=None):
+    # One uniform scramble labelled with its optimal length; returns
+    # (cells, length) or None if labelling ran out of budget
+    board = Board(grid_size)
+    board.shuffle(rng)
+    cells = list(board.cells)
+    if grid_size == perfect.GRID_SIZE:
+        return cells, perfect.get_table().distance(cells)
+    try:
+        return cells, len(solver.solve(cells, POOL_NODE_LIMIT))
+    except SearchLimitError:
+        return None
+
+
+def _factory(requests, results, seed):
+    # Factory process: label one scramble of each requested grid size and
+    # send back (grid size, puzzle or None, labellable)
+    try:
+        os.nice(FACTORY_NICENESS)
+    except (AttributeError, OSError):
+        pass  # Not available on this platform
+    rng = random.Random(seed)
+    solvers = {}
+    while True:
+        grid_size = requests.get()
+        if grid_size is None:
+            break
+        solver = None
+        if grid_size != perfect.GRID_SIZE:
+            if grid_size not in solvers:
+                solvers[grid_size] = Solver(grid_size, PatternDatabase.load(grid_size))
+            solver = solvers[grid_size]
+            if solver.pdb is None:
+                # Manhattan and linear conflicts alone cannot label uniform
+                # scrambles of this size within any sensible budget
+                results.put((grid_size, None, False))
+                continue
+        results.put((grid_size, generate(grid_size, rng, solver), True))
+
+
+class PuzzlePool:
+    def __init__(self, path=None, capacity=POOL_CAPACITY, seed=None):
+        self.path = path or pool_path()
+        self.capacity = capacity
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.process = None
+        self.changed = False
+        self.failures = {}  # grid size -> failed labels in a row
+        self.given_up = set()  # Grid sizes not worth more attempts this session
+        # grid size -> deque of (cells, optimal length)
+        self.puzzles = {grid_size: deque() for grid_size in GRID_SIZES}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        for grid_size, queue in self.puzzles.items():
+            puzzles = data.get(str(grid_size))
+            if not isinstance(puzzles, list):
+                continue
+            for puzzle in puzzles:
+                if len(queue) >= self.capacity:
+                    break
+                if valid_puzzle(grid_size, puzzle):
+                    queue.append((tuple(puzzle[0]), puzzle[1]))
+
+    def save(self):
+        with self.lock:
+            data = {str(grid_size): [[list(cells), length] for cells, length in queue]
+                    for grid_size, queue in self.puzzles.items()}
+            self.changed = False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + ".tmp", "w") as f:
+                json.dump(data, f)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError:
+            pass  # The pool still works in memory
+
+    def count(self, grid_size):
+        return len(self.puzzles.get(grid_size, ()))
+
+    def pop(self, grid_size):
+        # A ready (cells, optimal length) puzzle, or None if none is ready
+        with self.lock:
+            queue = self.puzzles.get(grid_size)
+            if not queue:
+                return None
+            self.changed = True
+            return queue.popleft()
+
+    def add(self, grid_size, cells, length):
+        # Returns False when the grid size has no pool or its pool is full
+        with self.lock:
+            queue = self.puzzles.get(grid_size)
+            if queue is None or len(queue) >= self.capacity:
+                return False
+            queue.append((tuple(cells), length))
+            self.changed = True
+            return True
+
+    def emptiest(self):
+        # Grid size with the fewest puzzles, or None if every pool is full or
+        # given up
+        with self.lock:
+            sizes = [grid_size for grid_size, queue in self.puzzles.items()
+                     if len(queue) < self.capacity and grid_size not in self.given_up]
+            return min(sizes, key=lambda grid_size: len(self.puzzles[grid_size]), default=None)
+
+    def record(self, grid_size, added, labellable=True):
+        # Book-keeping for one factory attempt at `grid_size`
+        if added:
+            self.failures.pop(grid_size, None)
+            return
+        self.failures[grid_size] = self.failures.get(grid_size, 0) + 1
+        if not labellable or self.failures[grid_size] >= MAX_FAILURES:
+            self.given_up.add(grid_size)
+
+    def run(self):
+        # Listener loop: keep the factory busy on the emptiest pool until
+        # every pool is full; this thread only waits on the factory
+        last_save = time.monotonic()
+        while not self.stop_event.is_set():
+            target = self.emptiest()
+            if target is None:
+                self.stop_event.wait(1)
+                continue
+            self.requests.put(target)
+            result = self.results.get()
+            if result is None:
+                break
+            grid_size, puzzle, labellable = result
+            self.record(grid_size, bool(puzzle) and self.add(grid_size, *puzzle), labellable)
+            if self.changed and time.monotonic() - last_save > SAVE_INTERVAL:
+                self.save()
+                last_save = time.monotonic()
+
+    def start(self):
+        if self.thread is None:
+            context = multiprocessing.get_context("spawn")
+            self.requests = context.Queue()
+            self.results = context.Queue()
+            self.process = context.Process(target=_factory, args=(self.requests, self.results, self.rng.getrandbits(64)),
+                                           name="puzzle-pool", daemon=True)
+            self.process.start()
+            self.thread = threading.Thread(target=self.run, name="puzzle-pool-listener", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            # A scramble being labelled is abandoned rather than waited for
+            self.requests.put(None)
+            self.results.put(None)
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.thread.join(timeout=1)
+            self.thread = None
+            self.process = None
+        if self.changed:
+            self.save()
@@ -0,0 +1,132 @@
+import cProfile
+import csv
+import io
+import json
+import pstats
+import time
+from collections import deque
+
+# Frame-time profiler for the main loop.
+#
+# The loop calls start_frame() before waiting for input and mark(phase) after
+# each phase; end_frame() closes the frame. Time spent blocked waiting for
+# input is recorded as "wait" but left out of the frame time, so an idle
+# game does not look slow. While disabled every call returns immediately.
+
+PHASES = ("wait", "events", "update", "draw", "display")
+WORK_PHASES = PHASES[1:]  # The phases that make up the frame time
+PROFILE_WINDOW = 300  # Frames kept for the rolling percentiles
+TRACE_LIMIT = 100000  # Frames kept for export; older frames are dropped
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW):
+        self.enabled = False
+        self.recent = deque(maxlen=window)  # Phase times of the latest frames
+        self.trace = deque(maxlen=TRACE_LIMIT)  # One tuple of phase times per frame
+        self.frame = 0
+        self.times = {}
+        self.last = 0.0
+        self.profile = None  # cProfile.Profile while profiling
+        self.profile_frames = 0
+        self.enabled_after = False  # State to return to once profiling ends
+
+    def enable(self, on=True):
+        # Turning on mid-frame starts timing from here; while profiling the
+        # change is deferred until the profile run ends
+        if self.profile is not None:
+            self.enabled_after = on
+            return
+        if on and not self.enabled:
+            self.times = {}
+            self.last = time.perf_counter()
+        self.enabled = on
+        if not on:
+            self.recent.clear()
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.times = {}
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        # Charges the time since the previous mark to `phase`
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.times[phase] = self.times.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def end_frame(self):
+        # Returns the finished cProfile stats once the last profiled frame ends
+        if not self.enabled:
+            return None
+        self.frame += 1
+        times = tuple(self.times.get(phase, 0.0) for phase in PHASES)
+        self.recent.append(times)
+        self.trace.append((self.frame,) + times)
+
+        if self.profile is not None:
+            self.profile_frames -= 1
+            if self.profile_frames <= 0:
+                self.profile.disable()
+                stats = pstats.Stats(self.profile)
+                self.profile = None
+                self.enable(self.enabled_after)
+                return stats
+        return None
+
+    def start_profile(self, frames):
+        # Runs cProfile over the next `frames` frames, timing them too; the
+        # previous enabled state comes back afterwards
+        if self.profile is None:
+            self.enabled_after = self.enabled
+            self.enable()
+            self.profile = cProfile.Profile()
+            self.profile_frames = frames
+            self.profile.enable()
+
+    def summary(self):
+        # Rolling frame-time percentiles in milliseconds, plus the mean
+        # per-phase cost over the same window
+        recent = self.recent
+        work = [PHASES.index(phase) for phase in WORK_PHASES]
+        frames = sorted(sum(times[i] for i in work) for times in recent)
+        result = {
+            "frames": len(frames),
+            "p50": percentile(frames, 0.50) * 1000,
+            "p95": percentile(frames, 0.95) * 1000,
+            "p99": percentile(frames, 0.99) * 1000,
+        }
+        for i, phase in enumerate(PHASES):
+            result[phase] = sum(times[i] for times in recent) / len(recent) * 1000 if recent else 0.0
+        return result
+
+    def export(self, path):
+        # Writes the per-frame trace as CSV or JSON, chosen by extension;
+        # times are in milliseconds
+        rows = [[frame[0]] + [round(t * 1000, 4) for t in frame[1:]] for frame in self.trace]
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump([dict(zip(("frame",) + PHASES, row)) for row in rows], f)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + PHASES)
+                writer.writerows(rows)
+        return len(rows)
+
+
+def format_stats(stats, limit=20):
+    # The top of a cProfile report, sorted by cumulative time
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
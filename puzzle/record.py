@@ -0,0 +1,228 @@
+import argparse
+import os
+import struct
+import time
+
+from .board import Board, pack_cells, unpack_cells
+from .paths import cache_dir
+
+# Game recordings: a 2-bit-per-move log plus periodic board snapshots.
+#
+# Every move slides the empty cell one step, so it fits in 2 bits (see
+# DIRECTIONS); four moves share a byte. A game is two files:
+#
+#   <id>.moves  HEADER, then the packed move stream
+#   <id>.snaps  the board every SNAPSHOT_INTERVAL moves, starting at move 0,
+#               as fixed-size packed records
+#
+# The header holds the move count, the elapsed time and a solved flag and is
+# rewritten after every move, each write going straight to the OS, so a
+# crashed game resumes from its last move. Any move number is reached by
+# loading the snapshot at or before it and replaying at most one interval of
+# moves.
+
+MAGIC = b"PZLG"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHIdB16s")  # magic, version, grid, interval, moves, elapsed, solved, image
+SNAPSHOT_INTERVAL = 64  # Moves between snapshots; a multiple of 4 keeps them byte-aligned
+MAX_SAVED_GAMES = 200  # Older recordings are deleted when a new game starts
+
+# Move code -> (dx, dy) of the empty cell
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def games_dir(directory=None):
+    return os.path.join(directory or cache_dir(), "games")
+
+
+def direction(grid_size, empty_from, empty_to):
+    # Move code for the empty cell stepping between two adjacent cells
+    dx = empty_to % grid_size - empty_from % grid_size
+    dy = empty_to // grid_size - empty_from // grid_size
+    return DIRECTIONS.index((dx, dy))
+
+
+class MoveLog:
+    # Appends moves to a recording; also used to continue a resumed one
+    def __init__(self, path, moves_file, snaps_file, grid_size, interval, moves, elapsed, solved, image_choice):
+        self.path = path
+        self.moves_file = moves_file
+        self.snaps_file = snaps_file
+        self.grid_size = grid_size
+        self.interval = interval
+        self.moves = moves
+        self.elapsed = elapsed
+        self.solved = solved
+        self.image_choice = image_choice
+        self.pending = 0  # The partly filled last byte of the move stream
+        if moves % 4:
+            moves_file.seek(HEADER.size + moves // 4)
+            self.pending = moves_file.read(1)[0]
+
+    @classmethod
+    def create(cls, grid_size, cells, image_choice="Numbers", directory=None, interval=SNAPSHOT_INTERVAL):
+        directory = directory or games_dir()
+        os.makedirs(directory, exist_ok=True)
+        prune(directory, MAX_SAVED_GAMES - 1)
+        path = os.path.join(directory, str(time.time_ns()))
+        moves_file = open(path + ".moves", "w+b", buffering=0)
+        snaps_file = open(path + ".snaps", "w+b", buffering=0)
+        snaps_file.write(pack_cells(cells))
+        log = cls(path, moves_file, snaps_file, grid_size, interval, 0, 0.0, False, image_choice)
+        log.write_header()
+        return log
+
+    @classmethod
+    def reopen(cls, path):
+        # Continue appending to an existing recording
+        replay = Replay(path)
+        replay.close()
+        moves_file = open(path + ".moves", "r+b", buffering=0)
+        snaps_file = open(path + ".snaps", "r+b", buffering=0)
+        snaps_file.truncate(replay.snapshots * replay.record_size)  # Drop a torn last record
+        return cls(path, moves_file, snaps_file, replay.grid_size, replay.interval, replay.moves,
+                   replay.elapsed, replay.solved, replay.image_choice)
+
+    def write_header(self):
+        self.moves_file.seek(0)
+        self.moves_file.write(HEADER.pack(MAGIC, VERSION, self.grid_size, self.interval, self.moves,
+                                          self.elapsed, self.solved, self.image_choice.encode()[:16]))
+
+    def append(self, empty_from, empty_to, cells, elapsed):
+        # Records one move (the empty cell stepping from one cell to the
+        # other); `cells` is the board after the move
+        shift = 2 * (self.moves % 4)
+        if not shift:
+            self.pending = 0
+        self.pending |= direction(self.grid_size, empty_from, empty_to) << shift
+        self.moves_file.seek(HEADER.size + self.moves // 4)
+        self.moves_file.write(bytes((self.pending,)))
+
+        self.moves += 1
+        self.elapsed = elapsed
+        if self.moves % self.interval == 0:
+            self.snaps_file.seek(0, os.SEEK_END)
+            self.snaps_file.write(pack_cells(cells))
+        self.write_header()  # Last, so the count never covers a move not yet written
+
+    def finish(self, elapsed):
+        self.elapsed = elapsed
+        self.solved = True
+        self.write_header()
+
+    def close(self):
+        self.moves_file.close()
+        self.snaps_file.close()
+
+
+class Replay:
+    # Random access to a recording: board_at(n) costs one snapshot read and
+    # at most `interval` replayed moves
+    def __init__(self, path):
+        self.path = path
+        self.moves_file = open(path + ".moves", "rb")
+        self.snaps_file = open(path + ".snaps", "rb")
+        magic, version, grid_size, interval, moves, elapsed, solved, image = \
+            HEADER.unpack(self.moves_file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a puzzle recording")
+        self.grid_size = grid_size
+        self.interval = interval
+        self.moves = moves
+        self.elapsed = elapsed
+        self.solved = bool(solved)
+        self.image_choice = image.rstrip(b"\0").decode()
+        self.record_size = len(pack_cells(range(grid_size * grid_size)))
+        self.snapshots = min(os.fstat(self.snaps_file.fileno()).st_size // self.record_size,
+                             moves // interval + 1)
+
+    def snapshot(self, index):
+        self.snaps_file.seek(index * self.record_size)
+        return unpack_cells(self.snaps_file.read(self.record_size), self.grid_size)
+
+    def codes(self, start, stop):
+        # Move codes for moves start..stop-1
+        first = start // 4
+        self.moves_file.seek(HEADER.size + first)
+        data = self.moves_file.read((stop + 3) // 4 - first)
+        return [(data[i // 4 - first] >> 2 * (i % 4)) & 3 for i in range(start, stop)]
+
+    def board_at(self, move):
+        # Board after `move` moves (clamped to the recording)
+        move = max(0, min(move, self.moves))
+        index = min(move // self.interval, self.snapshots - 1)
+        board = Board(self.grid_size, self.snapshot(index))
+        n = self.grid_size
+        for code in self.codes(index * self.interval, move):
+            dx, dy = DIRECTIONS[code]
+            board.move_index(board.empty_index + dy * n + dx)
+        return board
+
+    def close(self):
+        self.moves_file.close()
+        self.snaps_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def recordings(directory=None):
+    # Recording paths (without extension), oldest first
+    directory = directory or games_dir()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, name[:-6]) for name in sorted(names, key=lambda name: (len(name), name))
+            if name.endswith(".moves")]
+
+
+def latest_unfinished(directory=None):
+    # The newest recording of a game that was neither solved nor empty
+    paths = recordings(directory)
+    if not paths:
+        return None
+    try:
+        with Replay(paths[-1]) as replay:
+            return paths[-1] if replay.moves and not replay.solved else None
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def prune(directory, keep):
+    for path in recordings(directory)[:-keep or None]:
+        for extension in (".moves", ".snaps"):
+            try:
+                os.remove(path + extension)
+            except OSError:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect recorded sliding-puzzle games")
+    parser.add_argument("recording", nargs="?", help="recording path without extension (default: list recordings)")
+    parser.add_argument("--at", type=int, default=None, help="print the board after this many moves")
+    args = parser.parse_args(argv)
+
+    if args.recording is None:
+        for path in recordings():
+            with Replay(path) as replay:
+                state = "solved" if replay.solved else "unfinished"
+                print(f"{path}  {replay.grid_size}x{replay.grid_size}  {replay.moves} moves  "
+                      f"{replay.elapsed:.0f}s  {state}")
+        return
+
+    with Replay(args.recording) as replay:
+        move = replay.moves if args.at is None else args.at
+        board = replay.board_at(move)
+        width = len(str(board.size - 1))
+        print(f"After {min(max(move, 0), replay.moves)} of {replay.moves} moves:")
+        for y in range(board.grid_size):
+            print(" ".join(str(value or ".").rjust(width) for value in board.cells[y * board.grid_size:(y + 1) * board.grid_size]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from .board import Board, pack_cells
+
+# Multi-session puzzle server for races and leaderboards.
+#
+# Clients speak newline-delimited JSON over TCP, one message per line (the
+# framing a WebSocket gateway would forward as text frames). Requests carry
+# an "op" and a client-chosen "seq" that the reply echoes:
+#
+#   {"op": "new", "grid": 4}                   -> {"session": 7, "cells": [...], "moves": 0, ...}
+#   {"op": "move", "session": 7, "x": 2, "y": 3} -> {"ok": true, "moves": 1, "solved": false}
+#   {"op": "state", "session": 7}              -> {"session": 7, "cells": [...], "moves": 1, ...}
+#   {"op": "watch", "session": 7}              -> the state, then deltas as the session moves
+#
+# A session belongs to the connection that created it and ends with it. Moves
+# are validated exactly like PuzzleGame.move_tile: only a tile next to the
+# empty cell slides, and only a successful slide counts as a move. Watchers
+# get state deltas batched every BROADCAST_INTERVAL as
+# {"deltas": [[session, tile cell, empty cell, moves], ...]}; a watcher that
+# falls more than WRITE_HIGH_WATER bytes behind is disconnected rather than
+# buffered for without bound.
+
+BROADCAST_INTERVAL = 0.05  # Seconds between delta broadcasts
+MAX_SESSIONS = 100000
+MAX_GRID = 16  # Cell values must fit a byte
+WRITE_HIGH_WATER = 1 << 16  # Buffered bytes per connection before waiting for the socket
+READ_SIZE = 1 << 16
+MAX_LINE = 1 << 16  # Longest request accepted; longer ones drop the connection
+DEFAULT_PORT = 8765
+
+
+class Session:
+    # One game: the board as a bytearray plus its counters
+    __slots__ = ("id", "grid_size", "cells", "empty", "misplaced", "moves", "started", "solved_at", "owner")
+
+    def __init__(self, session_id, grid_size, cells, owner=None):
+        self.id = session_id
+        self.grid_size = grid_size
+        self.cells = bytearray(pack_cells(cells))  # One byte per cell up to MAX_GRID
+        self.empty = self.cells.index(0)
+        self.misplaced = sum(1 for i, value in enumerate(self.cells) if value and value != i + 1)
+        self.moves = 0
+        self.started = time.monotonic()
+        self.solved_at = None
+        self.owner = owner
+
+    @property
+    def solved(self):
+        return self.misplaced == 0
+
+    def move(self, x, y):
+        # Slide the tile at (x, y) into the empty cell if they are adjacent;
+        # returns whether it moved (Board.move semantics)
+        n = self.grid_size
+        if not (0 <= x < n and 0 <= y < n):
+            return False
+        index = y * n + x
+        empty = self.empty
+        if abs(x - empty % n) + abs(y - empty // n) != 1:
+            return False
+
+        cells = self.cells
+        value = cells[index]
+        if index == value - 1:
+            self.misplaced += 1
+        elif empty == value - 1:
+            self.misplaced -= 1
+        cells[empty] = value
+        cells[index] = 0
+        self.empty = index
+        self.moves += 1
+        if not self.misplaced and self.solved_at is None:
+            self.solved_at = time.monotonic()
+        return True
+
+    def state(self):
+        end = self.solved_at or time.monotonic()
+        return {"session": self.id, "grid": self.grid_size, "cells": list(self.cells), "moves": self.moves,
+                "solved": self.solved, "elapsed": round(end - self.started, 3)}
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class Connection:
+    __slots__ = ("writer", "sessions", "watching", "closed")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.sessions = set()  # Ids of the sessions this connection created
+        self.watching = set()
+        self.closed = False
+
+    def send(self, message):
+        # Deltas are never waited on, so a peer that stops reading is cut off
+        # once its buffer passes WRITE_HIGH_WATER instead of growing it
+        if self.closed:
+            return
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+            self.closed = True
+            transport.abort()
+            return
+        self.writer.write(encode(message))
+
+
+class PuzzleServer:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.ids = itertools.count(1)
+        self.sessions = {}
+        self.watchers = {}  # session id -> set of watching connections
+        self.pending = {}  # connection -> deltas waiting for the next broadcast
+        self.moves = 0
+        self.server = None
+        self.broadcaster = None
+
+    def new_session(self, grid_size, owner=None):
+        if not 2 <= grid_size <= MAX_GRID:
+            raise ValueError(f"grid must be between 2 and {MAX_GRID}")
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise ValueError("server is full")
+        board = Board(grid_size)
+        board.shuffle(self.rng)
+        session = Session(next(self.ids), grid_size, board.cells, owner)
+        self.sessions[session.id] = session
+        return session
+
+    def end_session(self, session_id):
+        self.sessions.pop(session_id, None)
+        for connection in self.watchers.pop(session_id, ()):
+            connection.watching.discard(session_id)
+
+    def handle(self, connection, message):
+        # Returns the reply for one request
+        op = message.get("op")
+        if op == "move":
+            session = self.sessions.get(message.get("session"))
+            if session is None or session.owner is not connection:
+                raise ValueError("no such session")
+            empty = session.empty
+            ok = session.move(message["x"], message["y"])
+            if ok:
+                self.moves += 1
+                watchers = self.watchers.get(session.id)
+                if watchers:
+                    delta = [session.id, session.empty, empty, session.moves]
+                    for watcher in watchers:
+                        self.pending.setdefault(watcher, []).append(delta)
+            return {"ok": ok, "moves": session.moves, "solved": session.solved}
+        if op == "new":
+            session = self.new_session(int(message.get("grid", 4)), connection)
+            connection.sessions.add(session.id)
+            return session.state()
+        if op in ("state", "watch"):
+            session = self.sessions.get(message.get("session"))
+            if session is None:
+                raise ValueError("no such session")
+            if op == "watch":
+                self.watchers.setdefault(session.id, set()).add(connection)
+                connection.watching.add(session.id)
+            return session.state()
+        raise ValueError(f"unknown op {op!r}")
+
+    def reply(self, connection, line):
+        message = {}
+        try:
+            message = json.loads(line)
+            reply = self.handle(connection, message)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            message = message if isinstance(message, dict) else {}
+            reply = {"error": str(e)}
+        if "seq" in message:
+            reply["seq"] = message["seq"]
+        return encode(reply)
+
+    async def serve_client(self, reader, writer):
+        # Requests are read in chunks and all the replies to one chunk go out
+        # in a single write, so a busy connection costs one syscall per batch
+        # rather than per move
+        connection = Connection(writer)
+        partial = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data or connection.closed:
+                    break
+                lines = (partial + data).split(b"\n")
+                partial = lines.pop()
+                if len(partial) > MAX_LINE:
+                    break
+                writer.write(b"".join([self.reply(connection, line) for line in lines if line]))
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            connection.closed = True
+            for session_id in connection.sessions:
+                self.end_session(session_id)
+            for session_id in connection.watching:
+                self.watchers.get(session_id, set()).discard(connection)
+            self.pending.pop(connection, None)
+            writer.close()
+
+    async def broadcast(self):
+        # Every BROADCAST_INTERVAL, one message per watcher with all its deltas
+        while True:
+            await asyncio.sleep(BROADCAST_INTERVAL)
+            pending, self.pending = self.pending, {}
+            for connection, deltas in pending.items():
+                connection.send({"deltas": deltas})
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.serve_client, host, port)
+        self.broadcaster = asyncio.create_task(self.broadcast())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.broadcaster:
+            self.broadcaster.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+class Client:
+    # Local client stand-in: one connection, requests matched to replies by
+    # seq; requests made in the same event-loop turn go out in one write
+    def __init__(self, reader, writer, on_deltas=None):
+        self.reader = reader
+        self.writer = writer
+        self.on_deltas = on_deltas
+        self.seqs = itertools.count(1)
+        self.waiting = {}  # seq -> future
+        self.outgoing = []
+        self.listener = asyncio.create_task(self.listen())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, on_deltas=None):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, on_deltas)
+
+    async def listen(self):
+        partial = b""
+        while True:
+            data = await self.reader.read(READ_SIZE)
+            if not data:
+                break
+            lines = (partial + data).split(b"\n")
+            partial = lines.pop()
+            for line in lines:
+                message = json.loads(line)
+                if "seq" in message:
+                    future = self.waiting.pop(message["seq"], None)
+                    if future is not None and not future.done():
+                        future.set_result(message)
+                elif "deltas" in message and self.on_deltas:
+                    self.on_deltas(message["deltas"])
+        for future in self.waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError("server closed the connection"))
+
+    def request(self, op, **fields):
+        # Queues a request; await the result for its reply
+        seq = next(self.seqs)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.waiting[seq] = future
+        fields["op"] = op
+        fields["seq"] = seq
+        if not self.outgoing:
+            loop.call_soon(self.flush)
+        self.outgoing.append(encode(fields))
+        return future
+
+    def flush(self):
+        self.writer.write(b"".join(self.outgoing))
+        self.outgoing = []
+
+    async def close(self):
+        self.writer.close()
+        await self.listener
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, seed=None):
+    async def run():
+        server = PuzzleServer(seed)
+        await server.start(host, port)
+        print(f"Serving sliding puzzles on {host}:{port}", flush=True)
+        await server.server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host sliding-puzzle sessions over TCP (newline-delimited JSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible scrambles")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.seed)
+
+
+if __name__ == "__main__":
+    main()
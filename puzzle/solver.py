@@ -0,0 +1,320 @@
+from .board import goal_cells, is_solvable
+from .pdb import PatternDatabase
+
+FOUND = -1
+CANCEL_CHECK = 4095  # Mask: poll for cancellation every 4096 nodes
+
+
+class UnsolvableError(ValueError):
+    pass
+
+
+class SearchLimitError(RuntimeError):
+    pass
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+def _increasing_run(key):
+    # Length of the longest increasing subsequence of `key`
+    best = [1] * len(key)
+    for i in range(1, len(key)):
+        for j in range(i):
+            if key[j] < key[i] and best[j] + 1 > best[i]:
+                best[i] = best[j] + 1
+    return max(best, default=0)
+
+
+class Solver:
+    # Optimal IDA* search with Manhattan distance plus linear conflicts.
+    # The search runs on a single mutable list of cells with in-place
+    # make/unmake of moves; all lookup tables are built once per grid size.
+    # With a PatternDatabase the heuristic becomes the larger of linear
+    # conflicts and the additive pattern excess, both on top of Manhattan.
+    def __init__(self, grid_size, pdb=None):
+        n = grid_size
+        size = n * n
+        self.grid_size = n
+        self.size = size
+        self.goal = goal_cells(n)
+        self.pdb = pdb
+        self.nodes = 0
+
+        # The empty cell never counts towards any heuristic
+        self.goal_row = [-1] + [(value - 1) // n for value in range(1, size)]
+        self.goal_col = [-1] + [(value - 1) % n for value in range(1, size)]
+        self.distance = [[0] * size]
+        for value in range(1, size):
+            row, col = self.goal_row[value], self.goal_col[value]
+            self.distance.append([abs(i // n - row) + abs(i % n - col) for i in range(size)])
+
+        self.neighbors = []
+        for i in range(size):
+            x, y = i % n, i // n
+            cells = []
+            if x > 0:
+                cells.append(i - 1)
+            if x < n - 1:
+                cells.append(i + 1)
+            if y > 0:
+                cells.append(i - n)
+            if y < n - 1:
+                cells.append(i + n)
+            self.neighbors.append(tuple(cells))
+
+        # Each line has an integer key with one base-(n + 1) digit per cell:
+        # 1 + the goal position along the line of a tile sitting in its goal
+        # line, else 0. A move adds and subtracts entries of these tables, so
+        # the search keeps the keys up to date without building anything.
+        base = n + 1
+        self.row_code = [[0] * size for _ in range(size)]
+        self.col_code = [[0] * size for _ in range(size)]
+        for value in range(1, size):
+            row, col = self.goal_row[value], self.goal_col[value]
+            for i in range(row * n, row * n + n):
+                self.row_code[value][i] = (col + 1) * base ** (i % n)
+            for i in range(col, size, n):
+                self.col_code[value][i] = (row + 1) * base ** (i // n)
+
+        # Linear-conflict cost per line key, filled in as keys are met
+        self.conflicts = {}
+
+    def conflict(self, key):
+        cost = self.conflicts.get(key)
+        if cost is None:
+            base = self.grid_size + 1
+            goals = []
+            rest = key
+            while rest:
+                rest, digit = divmod(rest, base)
+                if digit:
+                    goals.append(digit)
+            cost = self.conflicts[key] = 2 * (len(goals) - _increasing_run(goals))
+        return cost
+
+    def row_key(self, cells, row):
+        n = self.grid_size
+        row_code = self.row_code
+        return sum(row_code[cells[i]][i] for i in range(row * n, row * n + n))
+
+    def col_key(self, cells, col):
+        col_code = self.col_code
+        return sum(col_code[cells[i]][i] for i in range(col, self.size, self.grid_size))
+
+    def row_conflict(self, cells, row):
+        return self.conflict(self.row_key(cells, row))
+
+    def col_conflict(self, cells, col):
+        return self.conflict(self.col_key(cells, col))
+
+    def manhattan(self, cells):
+        return sum(self.distance[value][i] for i, value in enumerate(cells))
+
+    def linear_conflicts(self, cells):
+        cells = list(cells)
+        return sum(self.row_conflict(cells, line) + self.col_conflict(cells, line)
+                   for line in range(self.grid_size))
+
+    def pattern_excess(self, cells):
+        if self.pdb is None:
+            return 0
+        pos = [0] * self.size
+        for i, value in enumerate(cells):
+            pos[value] = i
+        return sum(self.pdb.excess(index, pos) for index in range(len(self.pdb.patterns)))
+
+    def heuristic(self, cells):
+        return self.manhattan(cells) + max(self.linear_conflicts(cells), 2 * self.pattern_excess(cells))
+
+    def check(self, cells):
+        if sorted(cells) != list(range(self.size)):
+            raise ValueError(f"expected a permutation of 0..{self.size - 1}")
+        if not is_solvable(cells, self.grid_size):
+            raise UnsolvableError("board cannot reach the goal layout")
+
+    def solve(self, cells, max_nodes=None, cancel=None, progress=None):
+        # Returns the optimal sequence of tile positions (x, y) to slide, in
+        # the same coordinates PuzzleGame.move_tile takes. `cancel()` is
+        # polled every CANCEL_CHECK nodes; `progress(move)` is called after
+        # each deepening pass with the first move towards the most promising
+        # position seen so far.
+        self.nodes = 0
+        self.check(cells)
+        n = self.grid_size
+        path, _ = self.search(cells, max_nodes=max_nodes, cancel=cancel, progress=progress)
+        return [(i % n, i // n) for i in path]
+
+    def search(self, cells, g=0, prev=-1, bound=None, passes=None, max_nodes=None, cancel=None, progress=None):
+        # IDA* deepening passes from `cells`, reached after `g` moves with the
+        # empty cell last at `prev` (that move is not undone). Starts at
+        # `bound` (default: the heuristic) and stops after `passes` passes.
+        # Returns (cells slid, in order, or None; the next bound to try).
+        # self.nodes keeps counting across calls.
+        n = self.grid_size
+        cells = list(cells)
+        pos = [0] * self.size
+        for i, value in enumerate(cells):
+            pos[value] = i
+        distance = self.distance
+        neighbors = self.neighbors
+        goal_row, goal_col = self.goal_row, self.goal_col
+        row_code, col_code = self.row_code, self.col_code
+        conflicts, conflict = self.conflicts, self.conflict
+        row_key = [self.row_key(cells, line) for line in range(n)]
+        col_key = [self.col_key(cells, line) for line in range(n)]
+        row_lc = [conflict(key) for key in row_key]
+        col_lc = [conflict(key) for key in col_key]
+        pdb = self.pdb
+        if pdb is not None:
+            pattern_of, pattern_excess = pdb.pattern_of, pdb.excess
+            excess = [pattern_excess(index, pos) for index in range(len(pdb.patterns))]
+        limit = max_nodes if max_nodes is not None else float("inf")
+        path = []
+        closest = [float("inf"), None]  # Lowest h seen, first move towards it
+
+        def search(empty, g, bound, prev, md, lc, ex):
+            self.nodes += 1
+            h = md + (lc if lc > ex else ex)
+            f = g + h
+            if f > bound:
+                return f
+            if h == 0:
+                return FOUND
+            if h < closest[0] and path:
+                closest[0], closest[1] = h, path[0]
+            if self.nodes > limit:
+                raise SearchLimitError(f"no solution within {max_nodes} nodes")
+            if cancel is not None and not self.nodes & CANCEL_CHECK and cancel():
+                raise SearchCancelled()
+
+            best = None
+            for tile in neighbors[empty]:
+                if tile == prev:
+                    continue
+
+                # Make the move
+                value = cells[tile]
+                cells[empty] = value
+                cells[tile] = 0
+                child_md = md + distance[value][empty] - distance[value][tile]
+                child_lc = lc
+                line = saved = -1
+                horizontal = tile - empty in (1, -1)
+                if horizontal:
+                    # The order within the row is unchanged, so only its key
+                    # moves; the tile's own goal column is the one that can
+                    # gain or lose a conflict
+                    codes = row_code[value]
+                    shift = codes[empty] - codes[tile]
+                    row_key[empty // n] += shift
+                    target = goal_col[value]
+                    if target == tile % n or target == empty % n:
+                        codes = col_code[value]
+                        line, saved, delta = target, col_lc[target], codes[empty] - codes[tile]
+                        key = col_key[line] = col_key[line] + delta
+                        cost = conflicts.get(key)
+                        col_lc[line] = cost = conflict(key) if cost is None else cost
+                        child_lc += cost - saved
+                else:
+                    codes = col_code[value]
+                    shift = codes[empty] - codes[tile]
+                    col_key[empty % n] += shift
+                    target = goal_row[value]
+                    if target == tile // n or target == empty // n:
+                        codes = row_code[value]
+                        line, saved, delta = target, row_lc[target], codes[empty] - codes[tile]
+                        key = row_key[line] = row_key[line] + delta
+                        cost = conflicts.get(key)
+                        row_lc[line] = cost = conflict(key) if cost is None else cost
+                        child_lc += cost - saved
+                child_ex = ex
+                if pdb is not None:
+                    # Only the moved tile's pattern can change its table entry
+                    pos[value] = empty
+                    pattern = pattern_of[value]
+                    saved_excess = excess[pattern]
+                    excess[pattern] = pattern_excess(pattern, pos)
+                    child_ex += 2 * (excess[pattern] - saved_excess)
+
+                path.append(tile)
+                t = search(tile, g + 1, bound, empty, child_md, child_lc, child_ex)
+                if t == FOUND:
+                    return FOUND
+                path.pop()
+
+                # Unmake the move
+                cells[tile] = value
+                cells[empty] = 0
+                if horizontal:
+                    row_key[empty // n] -= shift
+                    if line >= 0:
+                        col_key[line] -= delta
+                        col_lc[line] = saved
+                else:
+                    col_key[empty % n] -= shift
+                    if line >= 0:
+                        row_key[line] -= delta
+                        row_lc[line] = saved
+                if pdb is not None:
+                    pos[value] = tile
+                    excess[pattern] = saved_excess
+
+                if best is None or t < best:
+                    best = t
+            return best if best is not None else float("inf")
+
+        empty = cells.index(0)
+        md = self.manhattan(cells)
+        lc = sum(row_lc) + sum(col_lc)
+        ex = 2 * sum(excess) if pdb is not None else 0
+        if bound is None:
+            bound = g + md + max(lc, ex)
+        while passes is None or passes > 0:
+            t = search(empty, g, bound, prev, md, lc, ex)
+            if t == FOUND:
+                return path, bound
+            bound = t
+            if t == float("inf"):
+                break  # Nothing left below this subtree
+            if passes is not None:
+                passes -= 1
+            if progress is not None and closest[1] is not None:
+                progress((closest[1] % n, closest[1] // n))
+        return None, bound
+
+    def next_move(self, cells, max_nodes=None, cancel=None, progress=None):
+        # First tile (x, y) on an optimal path, or None if already solved
+        moves = self.solve(cells, max_nodes, cancel, progress)
+        return moves[0] if moves else None
+
+    def greedy_move(self, cells):
+        # Cheap fallback when the search budget runs out: the movable tile
+        # whose slide lowers the heuristic the most
+        cells = list(cells)
+        empty = cells.index(0)
+        best = best_h = None
+        for tile in self.neighbors[empty]:
+            cells[empty], cells[tile] = cells[tile], 0
+            h = self.heuristic(cells)
+            cells[tile], cells[empty] = cells[empty], 0
+            if best_h is None or h < best_h:
+                best, best_h = tile, h
+        return (best % self.grid_size, best // self.grid_size) if best is not None else None
+
+
+_solvers = {}
+
+
+def get_solver(grid_size):
+    # Solvers are cached per grid size so their tables are only built once;
+    # pattern databases are used whenever they have been generated
+    solver = _solvers.get(grid_size)
+    if solver is None:
+        solver = _solvers[grid_size] = Solver(grid_size, PatternDatabase.load(grid_size))
+    return solver
+
+
+def solve(cells, grid_size, max_nodes=None):
+    return get_solver(grid_size).solve(cells, max_nodes)
@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_directory(tmp_path_factory):
+    # Tables, pools and hint caches built by the tests go to a private
+    # directory instead of the player's cache
+    previous = os.environ.get("PUZZLE_CACHE_DIR")
+    os.environ["PUZZLE_CACHE_DIR"] = str(tmp_path_factory.mktemp("cache"))
+    yield os.environ["PUZZLE_CACHE_DIR"]
+    if previous is None:
+        del os.environ["PUZZLE_CACHE_DIR"]
+    else:
+        os.environ["PUZZLE_CACHE_DIR"] = previous
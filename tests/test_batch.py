@@ -0,0 +1,51 @@
+import io
+import json
+
+from puzzle import perfect
+from puzzle.batch import run
+
+BOARDS = [
+    "# comment lines and blank lines are skipped",
+    "",
+    "1 2 3 4 5 6 7 0 8",
+    '{"id": "hard", "cells": [8, 6, 7, 2, 5, 4, 3, 0, 1]}',
+    "1,2,3,4,5,6,0,7,8",
+]
+
+
+def solve(lines, ordered=True):
+    out = io.StringIO()
+    written = run(io.StringIO("\n".join(lines) + "\n"), out, workers=2, ordered=ordered)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert written == len(results)
+    return results
+
+
+def test_results_follow_input_order_with_ids():
+    results = solve(BOARDS)
+    assert [result["id"] for result in results] == [3, "hard", 5]
+    table = perfect.get_table()
+    assert [result["length"] for result in results] == [
+        table.distance([1, 2, 3, 4, 5, 6, 7, 0, 8]),
+        table.distance([8, 6, 7, 2, 5, 4, 3, 0, 1]),
+        table.distance([1, 2, 3, 4, 5, 6, 0, 7, 8]),
+    ]
+    assert all(len(result["moves"]) == result["length"] for result in results)
+
+
+def test_unordered_output_has_every_board():
+    results = solve(BOARDS, ordered=False)
+    assert sorted(map(str, (result["id"] for result in results))) == ["3", "5", "hard"]
+
+
+def test_bad_boards_become_error_lines():
+    results = solve([
+        "1 2 3 x",
+        "1 2 3 4 5 6 7 8",
+        "2 1 3 4 5 6 7 8 0",
+        "1 2 3 4 5 6 7 8 0",
+    ])
+    assert [result["id"] for result in results] == [1, 2, 3, 4]
+    assert all("error" in result for result in results[:3])
+    assert "square" in results[1]["error"]
+    assert results[3]["length"] == 0
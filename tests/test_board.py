@@ -0,0 +1,105 @@
+import random
+from itertools import permutations
+
+import pytest
+
+from puzzle.board import Board, goal_cells, is_solvable, pack_cells, unpack_cells
+
+
+def inversions(cells):
+    tiles = [value for value in cells if value]
+    return sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+
+
+def reference_solvable(cells, grid_size):
+    if grid_size % 2:
+        return inversions(cells) % 2 == 0
+    row_from_bottom = grid_size - list(cells).index(0) // grid_size
+    return (inversions(cells) + row_from_bottom) % 2 == 1
+
+
+def test_is_solvable_matches_inversion_count_on_2x2():
+    for cells in permutations(range(4)):
+        assert is_solvable(cells, 2) == reference_solvable(cells, 2)
+
+
+@pytest.mark.parametrize("grid_size", [3, 4, 5, 6])
+def test_is_solvable_matches_inversion_count(grid_size):
+    rng = random.Random(grid_size)
+    for _ in range(200):
+        cells = list(range(grid_size * grid_size))
+        rng.shuffle(cells)
+        assert is_solvable(cells, grid_size) == reference_solvable(cells, grid_size)
+
+
+@pytest.mark.parametrize("grid_size", [3, 4, 5, 8])
+def test_shuffle_is_solvable_and_scrambled(grid_size):
+    rng = random.Random(grid_size)
+    board = Board(grid_size)
+    for _ in range(50):
+        board.shuffle(rng)
+        assert is_solvable(board.cells, grid_size)
+        assert list(board.cells) != goal_cells(grid_size)
+
+
+@pytest.mark.parametrize("grid_size", [3, 4, 7])
+def test_counters_match_a_rescan(grid_size):
+    rng = random.Random(grid_size)
+    board = Board(grid_size)
+    board.shuffle(rng)
+    for _ in range(500):
+        x, y = rng.randrange(grid_size), rng.randrange(grid_size)
+        movable = board.can_move(x, y)
+        assert board.move(x, y) == movable
+        rescan = Board(grid_size, board.cells)
+        assert board.misplaced == rescan.misplaced
+        assert board.manhattan == rescan.manhattan
+        assert list(board.pos) == list(rescan.pos)
+        assert board.is_solved() == (list(board.cells) == goal_cells(grid_size))
+
+
+def test_move_only_slides_neighbours_of_the_empty_cell():
+    board = Board(3)  # Empty cell at (2, 2)
+    assert not board.move(0, 0)
+    assert not board.move(3, 2)
+    assert board.move(1, 2)
+    assert board.empty_x == 1 and board.empty_y == 2
+    assert board.value_at(2, 2) == 8
+    assert board.misplaced == 1 and board.manhattan == 1
+
+
+def test_set_cells_rejects_non_permutations():
+    with pytest.raises(ValueError):
+        Board(3, [0, 1, 2, 3, 4, 5, 6, 7, 7])
+
+
+@pytest.mark.parametrize("grid_size", [2, 3, 5])
+def test_lookups_follow_the_tiles(grid_size):
+    rng = random.Random(grid_size)
+    board = Board(grid_size)
+    board.shuffle(rng)
+    for _ in range(200):
+        movable = board.movable_cells()
+        assert sorted(movable) == [y * grid_size + x for y in range(grid_size) for x in range(grid_size)
+                                   if board.can_move(x, y)]
+        board.move_index(rng.choice(movable))
+        for value in range(grid_size * grid_size):
+            x, y = board.position_of(value)
+            assert board.value_at(x, y) == value
+
+
+def test_copy_is_independent():
+    board = Board(3)
+    copy = board.copy()
+    copy.move(1, 2)
+    assert board.is_solved() and not copy.is_solved()
+    assert copy.position_of(0) == (1, 2) and board.position_of(0) == (2, 2)
+
+
+@pytest.mark.parametrize("grid_size, width", [(3, 1), (16, 1), (17, 2)])
+def test_packed_cells_round_trip(grid_size, width):
+    board = Board(grid_size)
+    board.shuffle(random.Random(grid_size))
+    data = pack_cells(board.cells)
+    assert len(data) == grid_size * grid_size * width
+    assert unpack_cells(data, grid_size) == list(board.cells)
@@ -0,0 +1,59 @@
+from puzzle import perfect
+from puzzle.board import Board
+from puzzle.cache import HintCache
+from puzzle.solver import get_solver
+
+SCRAMBLE = [8, 6, 7, 2, 5, 4, 3, 0, 1]  # One of the two hardest 3x3 boards
+
+
+def positions(cells, grid_size, moves):
+    # The board before each move of a solution
+    board = Board(grid_size)
+    board.set_cells(cells)
+    result = []
+    for x, y in moves:
+        result.append(list(board.cells))
+        board.move_index(y * grid_size + x)
+    return result
+
+
+def test_put_path_caches_every_suffix():
+    moves = get_solver(3).solve(SCRAMBLE)
+    cache = HintCache()
+    cache.put_path(SCRAMBLE, 3, moves)
+    table = perfect.get_table()
+    for k, cells in enumerate(positions(SCRAMBLE, 3, moves)):
+        move, distance = cache.get(cells, 3)
+        assert move == moves[k]
+        assert distance == len(moves) - k == table.distance(cells)
+    assert cache.stats()["hits"] == len(moves)
+
+
+def test_least_recently_used_entries_are_evicted():
+    moves = get_solver(3).solve(SCRAMBLE)
+    boards = positions(SCRAMBLE, 3, moves)
+    cache = HintCache(capacity=3)
+    cache.put_path(SCRAMBLE, 3, moves[:3])
+    assert cache.get(boards[0], 3) is not None  # Now the most recent
+    cache.put_path(boards[3], 3, moves[3:4])
+    assert cache.get(boards[1], 3) is None
+    assert cache.get(boards[0], 3) is not None
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"]) == (3, 1)
+    assert (stats["hits"], stats["misses"], stats["disk_hits"]) == (2, 1, 0)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_positions_are_found_on_disk_after_reopening(tmp_path):
+    path = str(tmp_path / "hints.sqlite")
+    moves = get_solver(3).solve(SCRAMBLE)
+    cache = HintCache(path=path)
+    cache.put_path(SCRAMBLE, 3, moves)
+    cache.close()
+
+    cache = HintCache(path=path)
+    assert cache.get(SCRAMBLE, 3) == (moves[0], len(moves))
+    assert cache.get(SCRAMBLE, 3) == (moves[0], len(moves))
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["hits"], stats["misses"]) == (1, 1, 0)
+    cache.close()
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from puzzle import evaluate as evaluate_module
+from puzzle.board import Board, is_solvable
+from puzzle.evaluate import evaluate
+from puzzle.solver import Solver
+
+
+@pytest.mark.parametrize("grid_size", [3, 4, 5, 8])
+def test_evaluate_matches_board_and_solver(grid_size, monkeypatch):
+    monkeypatch.setattr(evaluate_module, "CHUNK_SIZE", 7)  # Several chunks and a partial one
+    rng = random.Random(grid_size)
+    boards = []
+    for _ in range(40):
+        cells = list(range(grid_size * grid_size))
+        rng.shuffle(cells)  # Solvable and unsolvable alike
+        boards.append(cells)
+
+    result = evaluate(numpy.array(boards, numpy.uint16), grid_size)
+    solver = Solver(grid_size)
+    for i, cells in enumerate(boards):
+        board = Board(grid_size, cells)
+        assert result["solvable"][i] == is_solvable(cells, grid_size)
+        assert result["manhattan"][i] == board.manhattan
+        assert result["misplaced"][i] == board.misplaced
+        assert result["linear_conflicts"][i] == solver.linear_conflicts(cells)
+
+
+def test_evaluate_rejects_bad_input():
+    with pytest.raises(ValueError):
+        evaluate(numpy.zeros(9))
+    with pytest.raises(ValueError):
+        evaluate(numpy.zeros((2, 8)))
+    with pytest.raises(ValueError):
+        evaluate(numpy.zeros((2, 9)))
+
+
+def test_evaluate_accepts_no_boards():
+    result = evaluate(numpy.empty((0, 16), numpy.uint8), 4)
+    assert all(len(values) == 0 for values in result.values())
+
+
+def test_evaluate_gives_the_same_result_for_any_integer_type():
+    rng = random.Random(1)
+    boards = []
+    for _ in range(30):
+        cells = list(range(16))
+        rng.shuffle(cells)
+        boards.append(cells)
+    expected = evaluate(numpy.array(boards, numpy.int64), 4)
+    for dtype in (numpy.uint8, numpy.uint16, numpy.int32):
+        result = evaluate(numpy.array(boards, dtype))  # Grid size from the row length
+        for name, values in expected.items():
+            assert numpy.array_equal(result[name], values)
@@ -0,0 +1,21 @@
+import random
+
+from puzzle import perfect
+from puzzle.board import Board
+from puzzle.parallel import ParallelSolver
+
+
+def test_parallel_solutions_are_optimal():
+    rng = random.Random(5)
+    table = perfect.get_table()
+    with ParallelSolver(3, workers=2) as solver:
+        for _ in range(4):
+            board = Board(3)
+            board.shuffle(rng)
+            start = list(board.cells)
+            moves = solver.solve(start)
+            assert len(moves) == table.distance(start)
+            for x, y in moves:
+                board.move_index(y * 3 + x)
+            assert board.cells == Board(3).cells
+        assert solver.solve(Board(3).cells) == []
@@ -0,0 +1,40 @@
+import random
+
+from puzzle import perfect
+from puzzle.board import Board
+from puzzle.pdb import PatternDatabase, generate, placement_count, rank, unrank
+from puzzle.solver import Solver
+
+PATTERNS = [(1, 2, 4, 5), (3, 6, 7, 8)]
+
+
+def test_rank_and_unrank_are_inverse():
+    rng = random.Random(1)
+    for size, k in ((9, 4), (16, 6), (25, 6)):
+        count = placement_count(size, k)
+        for r in [0, count - 1] + [rng.randrange(count) for _ in range(500)]:
+            positions = unrank(r, size, k)
+            assert len(set(positions)) == k and max(positions) < size
+            assert rank(positions, size) == r
+
+
+def test_3x3_tables_are_admissible_and_load(tmp_path):
+    generate(3, PATTERNS, directory=str(tmp_path))
+    pdb = PatternDatabase.load(3, PATTERNS, directory=str(tmp_path))
+    solver = Solver(3, pdb)
+    table = perfect.get_table()
+    rng = random.Random(2)
+    board = Board(3)
+    tighter = 0
+    for _ in range(200):
+        board.shuffle(rng)
+        bound = board.manhattan + 2 * solver.pattern_excess(board.cells)
+        assert bound <= table.distance(board.cells)
+        tighter += solver.pattern_excess(board.cells) > 0
+        assert len(solver.solve(board.cells)) == table.distance(board.cells)
+    assert tighter  # The tables add something over Manhattan
+    pdb.close()
+
+
+def test_missing_tables_load_as_none(tmp_path):
+    assert PatternDatabase.load(4, directory=str(tmp_path)) is None
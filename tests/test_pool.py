@@ -0,0 +1,64 @@
+import json
+import random
+
+from puzzle import perfect
+from puzzle.board import is_solvable
+from puzzle.pool import MAX_FAILURES, PuzzlePool, generate
+
+
+def test_generated_puzzles_carry_their_optimal_length():
+    rng = random.Random(1)
+    table = perfect.get_table()
+    for _ in range(20):
+        cells, length = generate(3, rng)
+        assert is_solvable(cells, 3)
+        assert length == table.distance(cells)
+
+
+def test_pool_is_bounded_and_first_in_first_out(tmp_path):
+    pool = PuzzlePool(str(tmp_path / "pool.json"), capacity=2)
+    cells = list(range(1, 9)) + [0]
+    assert pool.add(3, cells, 30)
+    assert pool.add(3, cells, 12)
+    assert not pool.add(3, cells, 20)  # Full
+    assert not pool.add(7, cells, 20)  # No pool for this size
+    assert pool.pop(3) == (tuple(cells), 30)
+    assert pool.count(3) == 1
+    assert pool.pop(4) is None
+
+
+def test_pool_survives_a_save_and_load(tmp_path):
+    path = str(tmp_path / "pool.json")
+    pool = PuzzlePool(path)
+    cells = list(range(1, 16)) + [0]
+    pool.add(4, cells, 50)
+    pool.save()
+    assert PuzzlePool(path).pop(4) == (tuple(cells), 50)
+
+
+def test_failing_sizes_are_given_up(tmp_path):
+    pool = PuzzlePool(str(tmp_path / "pool.json"))
+    for _ in range(MAX_FAILURES):
+        pool.record(5, False)
+    pool.record(4, False, labellable=False)
+    assert pool.given_up == {4, 5}
+    assert pool.emptiest() == 3
+    pool.puzzles[3].extend([((), 0)] * pool.capacity)
+    assert pool.emptiest() is None
+
+
+def test_load_skips_bad_entries(tmp_path):
+    path = tmp_path / "pool.json"
+    good = list(range(1, 9)) + [0]
+    unsolvable = [2, 1] + list(range(3, 9)) + [0]
+    path.write_text(json.dumps({
+        "3": [[good, 4], [good[:-1], 4], [unsolvable, 4], [good, "x"], [good], None, [[None] * 9, 4], [good, 6]],
+        "4": {"easy": []},
+        "x": [],
+    }))
+    pool = PuzzlePool(str(path))
+    assert list(pool.puzzles[3]) == [(tuple(good), 4), (tuple(good), 6)]
+    assert pool.count(4) == 0
+
+    path.write_text("[1, 2]")
+    assert PuzzlePool(str(path)).count(3) == 0
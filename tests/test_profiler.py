@@ -0,0 +1,35 @@
+from puzzle.profiler import FrameProfiler
+
+
+def run_frames(profiler, count):
+    stats = None
+    for _ in range(count):
+        profiler.start_frame()
+        profiler.mark("events")
+        stats = profiler.end_frame() or stats
+    return stats
+
+
+def test_profile_run_restores_the_disabled_state():
+    profiler = FrameProfiler()
+    profiler.start_profile(3)
+    assert profiler.enabled
+    assert run_frames(profiler, 3) is not None
+    assert not profiler.enabled
+    assert len(profiler.trace) == 3
+
+
+def test_profile_run_keeps_an_enabled_profiler_on():
+    profiler = FrameProfiler()
+    profiler.enable()
+    profiler.start_profile(2)
+    run_frames(profiler, 2)
+    assert profiler.enabled
+
+
+def test_toggling_during_a_profile_run_applies_afterwards():
+    profiler = FrameProfiler()
+    profiler.start_profile(2)
+    profiler.enable()
+    assert run_frames(profiler, 2) is not None
+    assert profiler.enabled
@@ -0,0 +1,103 @@
+import random
+
+from puzzle.board import Board
+from puzzle.record import MoveLog, Replay, latest_unfinished, prune, recordings
+
+
+def play(log, board, moves, rng, elapsed=0.0):
+    # Random legal moves, logged like PuzzleGame.move_tile does; returns the
+    # board after each move
+    history = []
+    for _ in range(moves):
+        empty = board.empty_index
+        tile = rng.choice(board.movable_cells())
+        board.move_index(tile)
+        elapsed += 0.5
+        log.append(empty, tile, board.cells, elapsed)
+        history.append(list(board.cells))
+    return history
+
+
+def test_replay_reaches_every_recorded_position(tmp_path):
+    rng = random.Random(1)
+    board = Board(4)
+    board.shuffle(rng)
+    start = list(board.cells)
+    log = MoveLog.create(4, board.cells, "Grid", directory=str(tmp_path), interval=8)
+    history = play(log, board, 101, rng)
+    log.close()
+
+    with Replay(log.path) as replay:
+        assert replay.moves == 101
+        assert replay.grid_size == 4
+        assert replay.image_choice == "Grid"
+        assert not replay.solved
+        assert list(replay.board_at(0).cells) == start
+        for move, cells in enumerate(history, 1):
+            assert list(replay.board_at(move).cells) == cells
+        assert list(replay.board_at(1000).cells) == history[-1]
+
+
+def test_reopen_continues_the_recording(tmp_path):
+    rng = random.Random(2)
+    board = Board(3)
+    board.shuffle(rng)
+    log = MoveLog.create(3, board.cells, directory=str(tmp_path), interval=4)
+    history = play(log, board, 10, rng)
+    log.close()
+
+    log = MoveLog.reopen(log.path)
+    assert log.moves == 10
+    history += play(log, board, 7, rng, elapsed=log.elapsed)
+    log.finish(42.0)
+    log.close()
+
+    with Replay(log.path) as replay:
+        assert replay.moves == 17
+        assert replay.solved
+        assert replay.elapsed == 42.0
+        for move, cells in enumerate(history, 1):
+            assert list(replay.board_at(move).cells) == cells
+
+
+def test_large_boards_use_two_bytes_per_cell(tmp_path):
+    rng = random.Random(3)
+    board = Board(20)
+    board.shuffle(rng)
+    log = MoveLog.create(20, board.cells, directory=str(tmp_path), interval=4)
+    history = play(log, board, 9, rng)
+    log.close()
+    with Replay(log.path) as replay:
+        assert list(replay.board_at(9).cells) == history[-1]
+
+
+def test_latest_unfinished_skips_solved_and_empty_games(tmp_path):
+    directory = str(tmp_path)
+    assert latest_unfinished(directory) is None
+
+    rng = random.Random(4)
+    board = Board(3)
+    board.shuffle(rng)
+    log = MoveLog.create(3, board.cells, directory=directory)
+    play(log, board, 3, rng)
+    log.close()
+    assert latest_unfinished(directory) == log.path
+
+    log = MoveLog.create(3, board.cells, directory=directory)
+    log.close()
+    assert latest_unfinished(directory) is None  # The newest game has no moves
+    assert len(recordings(directory)) == 2
+
+
+def test_prune_keeps_the_newest_recordings(tmp_path):
+    directory = str(tmp_path)
+    paths = []
+    for _ in range(5):
+        log = MoveLog.create(3, Board(3).cells, directory=directory)
+        log.close()
+        paths.append(log.path)
+    assert recordings(directory) == paths
+    prune(directory, 2)
+    assert recordings(directory) == paths[-2:]
+    prune(directory, 0)
+    assert recordings(directory) == []
@@ -0,0 +1,92 @@
+import random
+
+from puzzle.board import Board
+from puzzle.server import WRITE_HIGH_WATER, Connection, PuzzleServer, Session, encode
+
+
+def test_session_move_matches_board_move():
+    rng = random.Random(1)
+    for grid_size in (3, 4, 6):
+        board = Board(grid_size)
+        board.shuffle(rng)
+        session = Session(1, grid_size, board.cells)
+        for _ in range(400):
+            x, y = rng.randrange(-1, grid_size + 1), rng.randrange(-1, grid_size + 1)
+            moved = board.move(x, y) if board.in_bounds(x, y) else False
+            assert session.move(x, y) == moved
+            assert list(session.cells) == list(board.cells)
+            assert session.empty == board.empty_index
+            assert session.misplaced == board.misplaced
+            assert session.solved == board.is_solved()
+
+
+def test_session_counts_only_successful_moves():
+    session = Session(1, 3, Board(3).cells)
+    assert not session.move(0, 0)
+    assert session.move(2, 1)
+    assert session.moves == 1
+    assert not session.solved
+    assert session.move(2, 2)
+    assert session.solved and session.solved_at is not None
+
+
+def test_moves_are_limited_to_the_owner():
+    server = PuzzleServer(seed=1)
+    owner, other = Connection(None), Connection(None)
+    state = server.handle(owner, {"op": "new", "grid": 3})
+    x, y = [(cell % 3, cell // 3) for cell in Board(3, state["cells"]).movable_cells()][0]
+    reply = server.reply(other, b'{"op": "move", "session": %d, "x": %d, "y": %d, "seq": 5}' % (state["session"], x, y))
+    assert b'"error"' in reply and b'"seq":5' in reply
+    assert server.handle(owner, {"op": "move", "session": state["session"], "x": x, "y": y})["ok"]
+
+
+def test_watchers_get_a_delta_per_move():
+    server = PuzzleServer(seed=2)
+    owner, watcher = Connection(None), Connection(None)
+    state = server.handle(owner, {"op": "new", "grid": 3})
+    session = state["session"]
+    assert server.handle(watcher, {"op": "watch", "session": session})["cells"] == state["cells"]
+    board = Board(3, state["cells"])
+    tile = board.movable_cells()[0]
+    empty = board.empty_index
+    server.handle(owner, {"op": "move", "session": session, "x": tile % 3, "y": tile // 3})
+    assert server.pending == {watcher: [[session, tile, empty, 1]]}
+
+    server.end_session(session)
+    assert not watcher.watching and session not in server.watchers
+
+
+def test_bad_requests_get_error_replies():
+    server = PuzzleServer(seed=3)
+    connection = Connection(None)
+    for line in (b"not json", b'{"op": "fly", "seq": 1}', b'{"op": "new", "grid": 40}', b'{"op": "state"}'):
+        assert b'"error"' in server.reply(connection, line)
+
+
+class StalledWriter:
+    # Stands in for a StreamWriter whose peer has stopped reading
+    def __init__(self):
+        self.transport = self
+        self.buffered = 0
+        self.aborted = False
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+    def abort(self):
+        self.aborted = True
+
+    def write(self, data):
+        self.buffered += len(data)
+
+
+def test_watchers_that_stop_reading_are_disconnected():
+    writer = StalledWriter()
+    connection = Connection(writer)
+    delta = {"deltas": [[1, 0, 1, 1]] * 100}
+    while not connection.closed:
+        connection.send(delta)
+    assert writer.aborted
+    assert WRITE_HIGH_WATER < writer.buffered <= WRITE_HIGH_WATER + len(encode(delta))
+    connection.send(delta)
+    assert writer.buffered <= WRITE_HIGH_WATER + len(encode(delta))
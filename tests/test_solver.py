@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from puzzle import perfect
+from puzzle.board import Board, goal_cells
+from puzzle.solver import SearchLimitError, Solver, UnsolvableError, _increasing_run
+
+
+def walk(grid_size, steps, rng):
+    board = Board(grid_size)
+    previous = -1
+    for _ in range(steps):
+        cells = [cell for cell in board.movable_cells() if cell != previous]
+        previous = board.empty_index
+        board.move_index(rng.choice(cells))
+    return board
+
+
+def reference_conflicts(cells, n):
+    # Linear conflicts straight from the definition, one line at a time
+    total = 0
+    for line in range(n):
+        row = [(value - 1) % n for value in cells[line * n:line * n + n] if value and (value - 1) // n == line]
+        col = [(value - 1) // n for value in cells[line::n] if value and (value - 1) % n == line]
+        total += 2 * (len(row) - _increasing_run(row)) + 2 * (len(col) - _increasing_run(col))
+    return total
+
+
+def apply(grid_size, cells, moves):
+    board = Board(grid_size, cells)
+    for x, y in moves:
+        assert board.move(x, y)
+    return board
+
+
+@pytest.fixture(scope="module")
+def table():
+    return perfect.get_table()
+
+
+def test_solution_length_matches_the_distance_table(table):
+    rng = random.Random(3)
+    solver = Solver(3)
+    board = Board(3)
+    for _ in range(100):
+        board.shuffle(rng)
+        moves = solver.solve(board.cells)
+        assert len(moves) == table.distance(board.cells)
+        assert apply(3, board.cells, moves).is_solved()
+
+
+def test_table_next_move_is_optimal(table):
+    rng = random.Random(4)
+    board = Board(3)
+    for _ in range(50):
+        board.shuffle(rng)
+        remaining = table.distance(board.cells)
+        assert board.move(*table.next_move(board.cells))
+        assert table.distance(board.cells) == remaining - 1
+
+
+@pytest.mark.parametrize("grid_size", [3, 4, 5, 6])
+def test_linear_conflicts_match_the_definition(grid_size):
+    rng = random.Random(grid_size)
+    solver = Solver(grid_size)
+    board = Board(grid_size)
+    for _ in range(100):
+        board.shuffle(rng)
+        assert solver.linear_conflicts(board.cells) == reference_conflicts(board.cells, grid_size)
+
+
+def test_4x4_walks_are_solved_within_the_walk_length():
+    rng = random.Random(5)
+    solver = Solver(4)
+    for _ in range(5):
+        board = walk(4, 30, rng)
+        moves = solver.solve(board.cells)
+        assert len(moves) <= 30
+        assert len(moves) % 2 == board.manhattan % 2
+        assert apply(4, board.cells, moves).is_solved()
+
+
+def test_solved_board_needs_no_moves():
+    assert Solver(4).solve(goal_cells(4)) == []
+
+
+def test_unsolvable_board_is_rejected():
+    cells = goal_cells(3)
+    cells[0], cells[1] = cells[1], cells[0]
+    with pytest.raises(UnsolvableError):
+        Solver(3).solve(cells)
+
+
+def test_node_limit_stops_the_search():
+    board = Board(5)
+    board.shuffle(random.Random(6))
+    with pytest.raises(SearchLimitError):
+        Solver(5).solve(board.cells, max_nodes=1000)
+
+
+def test_greedy_move_slides_a_movable_tile():
+    rng = random.Random(7)
+    solver = Solver(4)
+    board = Board(4)
+    for _ in range(20):
+        board.shuffle(rng)
+        assert board.can_move(*solver.greedy_move(board.cells))